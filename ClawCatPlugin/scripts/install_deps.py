@@ -7,15 +7,56 @@ Installs Python dependencies from requirements.txt
 import sys
 import subprocess
 import json
+import time
+import hashlib
+import importlib.util
 import shutil
 import platform
+import re
+import threading
+from collections import deque
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 PLUGIN_ROOT = Path(__file__).parent.parent.absolute()
 REQUIREMENTS_FILE = PLUGIN_ROOT / "requirements.txt"
+CACHE_DIR = Path.home() / ".claude" / "clawcat"
+_CONDA_CACHE = CACHE_DIR / "conda_path.json"
+DEPS_MARKER = CACHE_DIR / "deps_ok.json"
+DEPS_MARKER_MAX_AGE = 7 * 24 * 3600  # Re-verify installed deps at least weekly
+
+def read_conda_cache():
+    """Return the cached conda path if it still exists"""
+    try:
+        with open(_CONDA_CACHE, 'r') as f:
+            conda_path = json.load(f)
+        if conda_path and Path(conda_path).exists():
+            return conda_path
+    except (json.JSONDecodeError, OSError, TypeError):
+        pass
+    return None
+
+def write_conda_cache(conda_path):
+    """Remember the resolved conda path (or None) for later hook runs"""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(_CONDA_CACHE, 'w') as f:
+            json.dump(conda_path, f)
+    except OSError:
+        pass
 
 def find_conda():
-    """Find conda executable"""
+    """Find conda executable (cached across hook invocations)"""
+    conda_path = read_conda_cache()
+    if conda_path:
+        return conda_path
+    
+    conda_path = probe_conda()
+    write_conda_cache(conda_path)
+    return conda_path
+
+def probe_conda():
+    """Probe PATH and common install locations for conda"""
     # First try which/where
     conda_path = shutil.which("conda")
     if conda_path:
@@ -42,17 +83,67 @@ def find_conda():
     return None
 
 def check_package(package_name):
-    """Check if a package is installed"""
+    """Check if a package is installed (locates the module without importing it)"""
+    # PyQtWebEngine is a distribution name, the module lives under PyQt5
+    module_name = "PyQt5.QtWebEngineWidgets" if package_name == "PyQtWebEngine" else package_name
     try:
-        if package_name == "PyQtWebEngine":
-            # PyQtWebEngine needs special import
-            __import__("PyQt5.QtWebEngineWidgets")
-        else:
-            __import__(package_name)
-        return True
-    except ImportError:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
         return False
 
+def deps_marker_key():
+    """Key identifying this interpreter + requirements.txt contents"""
+    try:
+        requirements_hash = hashlib.sha256(REQUIREMENTS_FILE.read_bytes()).hexdigest()
+    except OSError:
+        return None
+    return [sys.executable, platform.python_version(), requirements_hash]
+
+def deps_marker_valid():
+    """True if dependencies were verified for this key within DEPS_MARKER_MAX_AGE
+
+    Shared with service_manager.py. Packages can be removed behind our back,
+    so the marker expires and the next run re-checks.
+    """
+    key = deps_marker_key()
+    try:
+        with open(DEPS_MARKER, 'r') as f:
+            marker = json.load(f)
+        age = time.time() - float(marker["checked"])
+        return key is not None and marker["key"] == key and 0 <= age < DEPS_MARKER_MAX_AGE
+    except (json.JSONDecodeError, OSError, KeyError, TypeError, ValueError):
+        return False
+
+def write_deps_marker():
+    """Record that dependencies are satisfied for this interpreter + requirements.txt"""
+    key = deps_marker_key()
+    if key is None:
+        return
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(DEPS_MARKER, 'w') as f:
+            json.dump({"key": key, "checked": time.time()}, f)
+    except OSError:
+        pass
+
+def requirement_specs(packages):
+    """Map package names to their requirements.txt lines (e.g. 'PyQt5>=5.15.10')"""
+    specs = {}
+    for line in REQUIREMENTS_FILE.read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            name = re.split(r"[<>=!~\[;\s]", line, maxsplit=1)[0]
+            specs[name.lower()] = line
+    return [specs.get(pkg.lower(), pkg) for pkg in packages]
+
+def pip_install_command(requirements):
+    """pip install command for this interpreter: uv's pip when it is on PATH
+    (parallel downloads, shared cache), otherwise python -m pip"""
+    uv = shutil.which("uv")
+    if uv:
+        return [uv, "pip", "install", "--python", sys.executable, *requirements]
+    return [sys.executable, "-m", "pip", "install", *requirements]
+
 def print_message(message, is_error=False):
     """Print message in hook format or normal format"""
     # Check if running as hook (non-interactive) or directly
@@ -67,51 +158,95 @@ def print_message(message, is_error=False):
         # Direct execution - use normal output
         print(message, file=sys.stderr if is_error else sys.stdout)
 
+def run_streaming(cmd, timeout, tail_lines=50):
+    """Run cmd, echoing its output to stderr as it arrives
+    
+    Only the last tail_lines lines are kept in memory for error reporting.
+    
+    Returns:
+        tuple: (returncode, tail_lines_deque)
+    
+    Raises:
+        subprocess.TimeoutExpired: if cmd runs longer than timeout seconds
+    """
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1
+    )
+    # Reading stdout blocks, so enforce the timeout by killing the process
+    timed_out = threading.Event()
+    def kill_on_timeout():
+        timed_out.set()
+        process.kill()
+    watchdog = threading.Timer(timeout, kill_on_timeout)
+    watchdog.start()
+    tail = deque(maxlen=tail_lines)
+    try:
+        for line in process.stdout:
+            tail.append(line)
+            sys.stderr.write(line)
+        returncode = process.wait()
+    finally:
+        watchdog.cancel()
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return returncode, tail
+
 def install_dependencies():
     """Install Python dependencies from requirements.txt using conda if available"""
     if not REQUIREMENTS_FILE.exists():
         print_message(f"error requirements.txt not found at {REQUIREMENTS_FILE}", is_error=True)
         return False
     
+    # Skip the import probe if this interpreter already passed it for this requirements.txt
+    if deps_marker_valid():
+        print_message("ok All Python dependencies are already installed")
+        return True
+    
     # Check if dependencies are already installed
     required_packages = ["requests", "psutil", "PyQt5", "PyQtWebEngine"]
-    missing = [pkg for pkg in required_packages if not check_package(pkg)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(check_package, required_packages))
+    missing = [pkg for pkg, ok in zip(required_packages, results) if not ok]
     
     if not missing:
         # All dependencies already installed
+        write_deps_marker()
         print_message("ok All Python dependencies are already installed")
         return True
     
+    # Only install what is missing (pinned as in requirements.txt) so pip
+    # doesn't re-resolve the packages that are already satisfied
+    requirements = requirement_specs(missing)
+    
     # Try to use conda if available
     conda_path = find_conda()
     if conda_path:
         print_message("Using conda environment...")
         # Use conda run to execute pip in conda environment
-        if platform.system() == "Windows":
-            cmd = [conda_path, "run", "-n", "base", "--no-capture-output", 
-                   "python", "-m", "pip", "install", "-r", str(REQUIREMENTS_FILE)]
-        else:
-            cmd = [conda_path, "run", "-n", "base", "--no-capture-output",
-                   "python", "-m", "pip", "install", "-r", str(REQUIREMENTS_FILE)]
+        cmd = [conda_path, "run", "-n", "base", "--no-capture-output",
+               "python", "-m", "pip", "install", *requirements]
     else:
         # No conda, use current Python
-        cmd = [sys.executable, "-m", "pip", "install", "-r", str(REQUIREMENTS_FILE)]
+        cmd = pip_install_command(requirements)
     
     # Install dependencies
     print_message(f"Installing Python dependencies: {', '.join(missing)}")
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
+        returncode, output_tail = run_streaming(cmd, timeout=300)  # 5 minute timeout
         
-        if result.returncode == 0:
+        if returncode == 0:
+            # The marker is keyed to this interpreter, so only record installs
+            # that went into it (conda installs into its base environment)
+            if not conda_path:
+                write_deps_marker()
             print_message(f"ok Installed Python dependencies: {', '.join(missing)}")
             return True
         else:
-            error_msg = result.stderr[:200] if result.stderr else result.stdout[:200]
+            error_msg = "".join(output_tail).strip()[-200:]
             print_message(f"error Failed to install dependencies: {error_msg}", is_error=True)
             return False
     except subprocess.TimeoutExpired:
@@ -8,7 +8,14 @@ import sys
 import json
 import os
 import platform
-import requests
+import re
+import time
+from pathlib import Path
+
+try:
+    import orjson  # Optional fast JSON parser
+except ImportError:
+    orjson = None
 
 # ============================================================================
 # Configuration
@@ -17,12 +24,100 @@ CAT_SERVER_URL = "http://localhost:22622/claude-hook"
 BLOCKING_TIMEOUT = 90      # Wait for user interaction (ask_permission, ask_user)
 NONBLOCKING_TIMEOUT = 0.1  # Fire-and-forget visual updates
 PLATFORM = platform.system()  # 'Windows', 'Darwin', 'Linux'
+TERM_CACHE_FILE = Path.home() / ".claude" / "clawcat" / "term_cache.json"
+TERM_CACHE_TTL = 24 * 3600  # Drop cached terminal PIDs older than a day
+
+# Terminal process-name patterns (matched against the lowercased process name)
+TERMINAL_PATTERNS = {
+    'Windows': re.compile(r'windowsterminal|wt\.exe'),                # Windows Terminal
+    'Darwin': re.compile(r'terminal|iterm2|warp|alacritty'),          # Terminal.app, iTerm2, Warp, Alacritty
+    'Linux': re.compile(r'gnome-terminal|konsole|xterm|alacritty'),   # Common Linux terminals
+}
+
+# Shared HTTP session, created on first send (keeps requests off the import path)
+_SESSION = None
 
 # ============================================================================
 # Core Functions
 # ============================================================================
 
-def get_terminal_pid():
+def pid_exists(pid):
+    """Cheap liveness check for a cached PID"""
+    if PLATFORM == 'Windows':
+        try:
+            import psutil
+            return psutil.pid_exists(pid)
+        except ImportError:
+            return False
+    try:
+        os.kill(pid, 0)
+        return True
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+
+
+def read_term_cache():
+    """Read the {session_id: {pid, ts}} terminal PID cache"""
+    try:
+        with open(TERM_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+
+def write_term_cache(cache):
+    """Write the terminal PID cache, dropping stale entries"""
+    now = time.time()
+    cache = {k: v for k, v in cache.items()
+             if isinstance(v, dict) and now - v.get("ts", 0) < TERM_CACHE_TTL}
+    try:
+        TERM_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(TERM_CACHE_FILE, 'w') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+
+def env_terminal_pid():
+    """TERMINAL_PID from the environment, or 0 if unset or not a number"""
+    try:
+        return int(os.environ.get("TERMINAL_PID", 0) or 0)
+    except ValueError:
+        return 0
+
+
+def get_terminal_pid(session_id=None):
+    """
+    Get the terminal PID, reusing the result cached for this Claude session
+    
+    Every hook fired by the same session carries the same session_id (hooks
+    run through a fresh shell, so our parent PID changes on every call), so
+    the process-tree walk only needs to run once per session.
+    """
+    env_pid = env_terminal_pid()
+    if env_pid:
+        return env_pid
+    
+    if not session_id:
+        return find_terminal_pid()
+    session_id = str(session_id)
+    
+    cache = read_term_cache()
+    entry = cache.get(session_id)
+    if isinstance(entry, dict) and entry.get("pid") and pid_exists(entry["pid"]):
+        return entry["pid"]
+    
+    terminal_pid = find_terminal_pid()
+    if terminal_pid:
+        cache[session_id] = {"pid": terminal_pid, "ts": time.time()}
+        write_term_cache(cache)
+    return terminal_pid
+
+
+def find_terminal_pid():
     """
     Find the terminal PID by recursively searching parent processes
     Cross-platform: supports Windows Terminal, macOS Terminal, iTerm2
@@ -30,6 +125,8 @@ def get_terminal_pid():
     try:
         import psutil
         current = psutil.Process(os.getpid())
+        # Platform-specific terminal detection (non-Windows/macOS use the Linux list)
+        terminal_pattern = TERMINAL_PATTERNS.get(PLATFORM, TERMINAL_PATTERNS['Linux'])
         
         # Search up to 10 levels in process tree
         for _ in range(10):
@@ -38,21 +135,8 @@ def get_terminal_pid():
                 if not parent or parent.pid == current.pid:
                     break
                 
-                name = parent.name().lower()
-                
-                # Platform-specific terminal detection
-                if PLATFORM == 'Windows':
-                    # Windows Terminal
-                    if 'windowsterminal' in name or 'wt.exe' in name:
-                        return parent.pid
-                elif PLATFORM == 'Darwin':
-                    # macOS: Terminal.app, iTerm2, Warp, Alacritty
-                    if any(term in name for term in ['terminal', 'iterm2', 'warp', 'alacritty']):
-                        return parent.pid
-                else:
-                    # Linux: common terminals
-                    if any(term in name for term in ['gnome-terminal', 'konsole', 'xterm', 'alacritty']):
-                        return parent.pid
+                if terminal_pattern.search(parent.name().lower()):
+                    return parent.pid
                 
                 current = parent
             except (psutil.NoSuchProcess, psutil.AccessDenied):
@@ -61,23 +145,27 @@ def get_terminal_pid():
         pass
     
     # Fallback to environment variable or 0
-    return int(os.environ.get("TERMINAL_PID", 0))
+    return env_terminal_pid()
 
 
 def read_hook_context():
     """Read hook input from stdin and parse as JSON
     
+    Reads raw bytes so the payload is decoded once, by the JSON parser.
+    
     Returns:
-        tuple: (parsed_context, raw_input_string)
+        tuple: (parsed_context, raw_input_bytes)
+        raw_input_bytes is only kept when parsing failed
     """
+    raw_input = b""
     try:
-        raw_input = sys.stdin.read()
+        raw_input = sys.stdin.buffer.read()
         if raw_input and raw_input.strip():
-            parsed = json.loads(raw_input)
-            return parsed, raw_input
+            parsed = orjson.loads(raw_input) if orjson else json.loads(raw_input)
+            return parsed, b""
     except (json.JSONDecodeError, Exception):
-        pass
-    return {}, ""
+        return {}, raw_input
+    return {}, b""
 
 
 def truncate_text(text, max_length=40):
@@ -87,10 +175,21 @@ def truncate_text(text, max_length=40):
     return text
 
 
+def get_session():
+    """Return the shared HTTP session, importing requests on first use"""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        _SESSION = requests.Session()
+        _SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4))
+    return _SESSION
+
+
 def send_payload(payload, timeout):
     """Send payload to cat server and return response with graceful degradation"""
+    import requests
     try:
-        response = requests.post(CAT_SERVER_URL, json=payload, timeout=timeout)
+        response = get_session().post(CAT_SERVER_URL, json=payload, timeout=timeout)
         return response if response.status_code == 200 else None
     except requests.exceptions.ConnectionError:
         # Service not running - fail silently for non-blocking hooks
@@ -294,43 +393,46 @@ def handle_notification(context, pid):
 # Main Entry Point
 # ============================================================================
 
+HOOK_HANDLERS = {
+    "UserPromptSubmit": handle_user_prompt_submit,
+    "PreToolUse": handle_pre_tool_use,
+    "PostToolUse": handle_post_tool_use,
+    "Stop": handle_stop,
+    "PermissionRequest": handle_permission_request,
+    "Notification": handle_notification,
+}
+
+
 def main():
     # Get hook type from environment or context
     hook_type = os.environ.get("CLAUDE_HOOK_TYPE", "")
+    if hook_type and hook_type not in HOOK_HANDLERS:
+        # Unknown hook type, ignore before doing any stdin/process work
+        sys.exit(0)
+    
     context, raw_input = read_hook_context()
     
     if not hook_type and "hook_event_name" in context:
         hook_type = context.get("hook_event_name", "")
     
-    # Get terminal PID
-    pid = get_terminal_pid()
-    
     # Dispatch to appropriate handler
-    handlers = {
-        "UserPromptSubmit": handle_user_prompt_submit,
-        "PreToolUse": handle_pre_tool_use,
-        "PostToolUse": handle_post_tool_use,
-        "Stop": handle_stop,
-        "PermissionRequest": handle_permission_request,
-        "Notification": handle_notification,
-    }
-    
-    handler = handlers.get(hook_type)
+    handler = HOOK_HANDLERS.get(hook_type)
     if not handler:
         # Unknown hook type, ignore
         sys.exit(0)
     
+    # Get terminal PID
+    pid = get_terminal_pid(context.get("session_id"))
+    
     # Build payload and send
     payload, timeout = handler(context, pid)
     
-    # Add raw hook input for debugging
-    if raw_input:
-        try:
-            # Parse raw input as JSON to include it in payload
-            payload["raw_input"] = json.loads(raw_input)
-        except (json.JSONDecodeError, Exception):
-            # If parsing fails, include raw string (first 1000 chars to avoid payload size issues)
-            payload["raw_input"] = raw_input[:1000] if len(raw_input) > 1000 else raw_input
+    # Add raw hook input for debugging (reuse the already parsed context)
+    if context:
+        payload["raw_input"] = context
+    elif raw_input:
+        # If parsing failed, include raw string (first 1000 chars to avoid payload size issues)
+        payload["raw_input"] = raw_input[:1000].decode("utf-8", errors="replace")
     
     response = send_payload(payload, timeout)
     
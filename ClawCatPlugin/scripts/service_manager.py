@@ -6,161 +6,215 @@ Manages the lifecycle of ClawCat services: Vite dev server, HTTP server, and PyQ
 
 import os
 import sys
+import functools
 import json
 import time
+import re
 import subprocess
 import platform
 import shutil
+import threading
+from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Optional, List
 
+try:
+    import psutil as _psutil
+except ImportError:
+    _psutil = None
+
+# JSON for the PID file: orjson when available (bytes in, bytes out)
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+# Dependency marker shared with the SessionStart installer (same directory)
+from install_deps import deps_marker_valid, write_deps_marker
+
 # Constants
 REQUIRED_PYTHON_VERSION = (3, 8)
-REQUIRED_NODE_VERSION = (18, 0)  # Only needed for building frontend
 SERVER_PORT = 22622  # Server serves both API and frontend
 PID_FILE_DIR = Path.home() / ".claude" / "clawcat"
 PID_FILE = PID_FILE_DIR / "pids.json"
+PID_LOCK_FILE = PID_FILE_DIR / "pids.lock"
+LOG_DIR = PID_FILE_DIR / "logs"  # Written by launch_window.py
+INSTALL_LOG = LOG_DIR / "install.log"  # Output of the last pip install
+WINDOW_STDERR_LOG = LOG_DIR / "window_stderr.log"  # Raw stderr of the last launched window (Unix)
 PLUGIN_ROOT = Path(__file__).parent.parent.absolute()
+INDEX_HTML = PLUGIN_ROOT / "public" / "index.html"  # Frontend (provided in the repository)
+REQUIREMENTS_FILE = PLUGIN_ROOT / "requirements.txt"
+LAUNCH_WINDOW_SCRIPT = PLUGIN_ROOT / "src" / "launch_window.py"
+LOG_PREFIX, LOG_SUFFIX = "clawcat_", ".log"  # Log names: clawcat_<%Y%m%d_%H%M%S>.log
+READY_FD_ENV = "CLAWCAT_READY_FD"  # Pipe fd the window process signals readiness on
+READY_FILE_ENV = "CLAWCAT_READY_FILE"  # Same signal on Windows (no fd passing): a file it creates
+WINDOW_READY_FILE = PID_FILE_DIR / "window.ready"
+_IS_WINDOWS = platform.system() == "Windows"
+
+@functools.lru_cache(maxsize=None)
+def which(name: str) -> Optional[str]:
+    """shutil.which, memoized: PATH is searched once per command per process"""
+    return shutil.which(name)
 
 def ensure_pid_dir():
     """Ensure PID directory exists"""
     PID_FILE_DIR.mkdir(parents=True, exist_ok=True)
 
 def check_environment() -> Dict:
-    """Check if Python and Node.js meet minimum version requirements"""
-    result = {"python": False, "node": False, "errors": []}
+    """Check if Python meets the minimum version requirement
+
+    Each entry in "errors" is {"kind": "python", "msg": str}.
+    """
+    result = {"python": False, "errors": []}
 
     # Check Python version
     current_python = sys.version_info[:2]
     if current_python >= REQUIRED_PYTHON_VERSION:
         result["python"] = True
     else:
-        result["errors"].append(
-            f"Python {REQUIRED_PYTHON_VERSION[0]}.{REQUIRED_PYTHON_VERSION[1]}+ required, "
-            f"found {current_python[0]}.{current_python[1]}"
-        )
-
-    # Check Node.js version
-    try:
-        node_version = subprocess.check_output(
-            ["node", "--version"],
-            stderr=subprocess.DEVNULL,
-            text=True
-        ).strip()
-        # Parse version like "v18.17.0"
-        version_parts = node_version.lstrip('v').split('.')
-        major = int(version_parts[0])
-        if major >= REQUIRED_NODE_VERSION[0]:
-            result["node"] = True
-        else:
-            result["errors"].append(
-                f"Node.js {REQUIRED_NODE_VERSION[0]}+ required, found {major}"
-            )
-    except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
-        result["errors"].append("Node.js not found or invalid version")
+        result["errors"].append({
+            "kind": "python",
+            "msg": f"Python {REQUIRED_PYTHON_VERSION[0]}.{REQUIRED_PYTHON_VERSION[1]}+ required, "
+                   f"found {current_python[0]}.{current_python[1]}"
+        })
 
     return result
 
 def check_port_available(port: int) -> bool:
-    """Check if a port is available"""
+    """Check if a port is available (nothing is listening on it)
+
+    Probes with a single connect() rather than a test bind, so the probe
+    never leaves a TIME_WAIT socket behind for the real server's bind.
+    """
     import socket
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind(('127.0.0.1', port))
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(0.05)
+        # Non-zero errno (refused / timed out): nobody is listening
+        return s.connect_ex(('127.0.0.1', port)) != 0
+
+def wait_for_ready_file(path: Path, process: subprocess.Popen, timeout: float = 10.0) -> bool:
+    """Poll (10ms) until the window process creates path; False if it exits first or on timeout"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if path.exists():
             return True
-    except OSError:
-        return False
-
-def check_dependencies() -> Dict:
-    """Check if required dependencies are installed"""
-    result = {"python_deps": False, "node_deps": False, "missing": []}
+        if process.poll() is not None:
+            return False
+        time.sleep(0.01)
+    return False
 
-    # Check Python dependencies
-    required_python_packages = ["PyQt5", "PyQtWebEngine", "requests", "psutil"]
-    missing_python = []
+def wait_for_ready_signal(ready_fd: int, timeout: float = 10.0) -> bool:
+    """Wait for the window process to write its ready byte to ready_fd
 
-    for package in required_python_packages:
+    Returns False on timeout or if the pipe closes first (child exited).
+    Always closes ready_fd.
+    """
+    import select
+    try:
+        readable, _, _ = select.select([ready_fd], [], [], timeout)
+        return bool(readable) and os.read(ready_fd, 1) == b"1"
+    except OSError:
+        return False
+    finally:
+        os.close(ready_fd)
+
+def pip_install_command(*args: str) -> List[str]:
+    """pip install command for this interpreter: uv's pip when it is on PATH
+    (parallel downloads, shared cache), otherwise python -m pip"""
+    uv = which("uv")
+    if uv:
+        return [uv, "pip", "install", "--python", sys.executable, *args]
+    return [sys.executable, "-m", "pip", "install", *args]
+
+def run_logged(cmd: List[str], timeout: float, **kwargs) -> int:
+    """Run an installer with its merged output written to INSTALL_LOG
+
+    The output goes straight to the file instead of being collected in
+    memory; read the end of it back with tail_lines() on failure.
+    Returns the exit code (raises TimeoutExpired / OSError like run()).
+    """
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    with open(INSTALL_LOG, 'wb') as log_file:
+        return subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            timeout=timeout,
+            check=False,
+            **kwargs
+        ).returncode
+
+def requirements_satisfied(requirements_file: Path) -> bool:
+    """True if every requirements.txt line is met by an installed distribution
+
+    Resolved locally from installed metadata (no pip, no index). Only plain
+    'name>=X' / 'name==X' lines and plain X.Y.Z installed versions are
+    understood; anything else (pre-releases, other operators) returns False
+    so pip makes the call.
+    """
+    from importlib.metadata import version, PackageNotFoundError
+    for line in requirements_file.read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        match = re.fullmatch(r"([A-Za-z0-9][A-Za-z0-9._-]*)\s*(>=|==)\s*([0-9][0-9.]*)", line)
+        if not match:
+            return False
+        name, op, wanted = match.groups()
         try:
-            __import__(package)
-        except ImportError:
-            missing_python.append(package)
-
-    if not missing_python:
-        result["python_deps"] = True
-    else:
-        result["missing"].extend(missing_python)
-
-    # Check if frontend files exist (should be provided in repository)
-    public_dir = PLUGIN_ROOT / "public"
-    index_html = public_dir / "index.html"
-    if not index_html.exists():
-        result["missing"].append("public/index.html (should be provided in repository)")
-
-    return result
-
-def find_conda():
-    """Find conda executable"""
-    # First try which/where
-    conda_path = shutil.which("conda")
-    if conda_path:
-        return conda_path
-    
-    # Try common locations
-    if platform.system() == "Windows":
-        conda_paths = [
-            Path.home() / "miniconda3" / "Scripts" / "conda.exe",
-            Path.home() / "anaconda3" / "Scripts" / "conda.exe",
-            Path("C:/ProgramData/miniconda3/Scripts/conda.exe"),
-            Path("C:/ProgramData/anaconda3/Scripts/conda.exe"),
-        ]
-    else:
-        conda_paths = [
-            Path.home() / "miniconda3" / "bin" / "conda",
-            Path.home() / "anaconda3" / "bin" / "conda",
-        ]
-    
-    for path in conda_paths:
-        if path.exists():
-            return str(path)
-    
-    return None
+            installed = version(name)
+        except PackageNotFoundError:
+            return False
+        if not re.fullmatch(r"\d+(\.\d+)*", installed) or not re.fullmatch(r"\d+(\.\d+)*", wanted):
+            return False
+        installed = tuple(map(int, installed.split(".")))
+        wanted = tuple(map(int, wanted.split(".")))
+        if op == "==" and installed != wanted or op == ">=" and installed < wanted:
+            return False
+    return True
 
 def install_python_deps() -> bool:
-    """Install Python dependencies using current Python environment"""
-    requirements_file = PLUGIN_ROOT / "requirements.txt"
-    if not requirements_file.exists():
-        print(f"Error: requirements.txt not found at {requirements_file}")
+    """Install Python dependencies using current Python environment
+
+    pip is skipped when the installed versions already satisfy
+    requirements.txt. Either way a clean result is recorded in the deps
+    marker shared with install_deps.py.
+    """
+    if not REQUIREMENTS_FILE.exists():
+        print(f"Error: requirements.txt not found at {REQUIREMENTS_FILE}")
         return False
 
+    if requirements_satisfied(REQUIREMENTS_FILE):
+        write_deps_marker()
+        print("ok Python dependencies already satisfy requirements.txt")
+        return True
+
     print("Installing Python dependencies...")
-    print(f"  Using Python: {sys.executable}")
+    print(f"  Using Python: {sys.executable}", flush=True)  # pip may take minutes
     
     # Use current Python (conda environment should already be activated by launcher script)
-    cmd = [sys.executable, "-m", "pip", "install", "-r", str(requirements_file)]
+    cmd = pip_install_command("-r", str(REQUIREMENTS_FILE))
     
     try:
-        # Run with timeout and capture output
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            timeout=300,  # 5 minute timeout
-            check=False  # Don't raise on non-zero exit
-        )
+        returncode = run_logged(cmd, timeout=300)  # 5 minute timeout
         
-        if result.returncode == 0:
+        if returncode == 0:
+            write_deps_marker()
             print("ok Python dependencies installed")
             return True
         else:
-            # Show error output if available
-            if result.stdout:
-                error_lines = result.stdout.strip().split('\n')
-                # Show last few lines of error
-                for line in error_lines[-5:]:
-                    if line.strip():
-                        print(f"  {line}")
-            print("error Failed to install Python dependencies")
+            # Show last few lines of error
+            for line in tail_lines(INSTALL_LOG, 5).splitlines():
+                if line.strip():
+                    print(f"  {line}")
+            print(f"error Failed to install Python dependencies (full output: {INSTALL_LOG})")
             return False
             
     except subprocess.TimeoutExpired:
@@ -170,114 +224,309 @@ def install_python_deps() -> bool:
         print(f"error Error installing Python dependencies: {e}")
         return False
 
-def install_node_deps() -> bool:
-    """Install Node.js dependencies"""
-    package_json = PLUGIN_ROOT / "package.json"
-    if not package_json.exists():
-        print(f"Error: package.json not found at {package_json}")
-        return False
-
-    print("Installing Node.js dependencies...")
-
-    # Determine which package manager to use
-    npm_cmd = "npm"
-    if shutil.which("pnpm"):
-        npm_cmd = "pnpm"
-    elif shutil.which("yarn"):
-        npm_cmd = "yarn"
-
+@contextmanager
+def buffered_stdout():
+    """Turn off stdout line buffering for the block and flush once at the end
+
+    Messages that precede a long wait are printed with flush=True so
+    progress still shows up promptly. Under pythonw sys.stdout is None
+    (print() is a no-op there), so the block just runs.
+    """
+    if sys.stdout is None:
+        yield
+        return
+    line_buffered = getattr(sys.stdout, "line_buffering", False)
+    if line_buffered:
+        sys.stdout.reconfigure(line_buffering=False)
     try:
-        subprocess.check_call(
-            [npm_cmd, "install"],
-            cwd=str(PLUGIN_ROOT),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        print(f"ok Node.js dependencies installed using {npm_cmd}")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error installing Node.js dependencies: {e}")
-        return False
+        yield
+    finally:
+        if line_buffered:
+            sys.stdout.reconfigure(line_buffering=True)
+        sys.stdout.flush()
+
+@contextmanager
+def pid_file_lock(exclusive: bool = True):
+    """Hold an advisory lock on PID_LOCK_FILE around PID file access
+
+    POSIX supports shared (read) locks; Windows locks are always exclusive.
+    msvcrt gives up after ~10s of contention; the block then runs unlocked
+    (PID file writes are still atomic replaces) rather than failing.
+    """
+    ensure_pid_dir()
+    fd = os.open(PID_LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if _IS_WINDOWS:
+            import msvcrt
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                locked = True
+            except OSError as e:
+                print(f"⚠ Could not lock {PID_LOCK_FILE} ({e}), continuing without the lock")
+                locked = False
+            try:
+                yield
+            finally:
+                if locked:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+# Last parsed PID file contents, keyed by the file's (mtime, size)
+_pid_cache: Optional[Dict] = None
+_pid_cache_key: Optional[tuple] = None
 
 def read_pids() -> Dict:
-    """Read PIDs from file"""
-    if not PID_FILE.exists():
+    """Read PIDs from file (re-parsed only when the file changes)"""
+    global _pid_cache, _pid_cache_key
+    try:
+        st = os.stat(PID_FILE)
+    except OSError:
         return {}
+    key = (st.st_mtime_ns, st.st_size)
+    if _pid_cache is not None and _pid_cache_key == key:
+        return dict(_pid_cache)
     try:
-        with open(PID_FILE, 'r') as f:
-            return json.load(f)
+        with pid_file_lock(exclusive=False):
+            pids = _loads(PID_FILE.read_bytes())
+            st = os.stat(PID_FILE)
     except (json.JSONDecodeError, IOError):
         return {}
+    _pid_cache, _pid_cache_key = pids, (st.st_mtime_ns, st.st_size)
+    return dict(pids)
 
 def write_pids(pids: Dict):
-    """Write PIDs to file"""
-    ensure_pid_dir()
-    with open(PID_FILE, 'w') as f:
-        json.dump(pids, f, indent=2)
+    """Write PIDs to file atomically (fsync'd temp file + rename, under the PID lock)"""
+    global _pid_cache, _pid_cache_key
+    # Per-process temp name: writers that had to go without the lock can't clobber each other
+    tmp_file = PID_FILE.with_suffix(f'.json.{os.getpid()}.tmp')
+    with pid_file_lock():
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.write(fd, _dumps(pids))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, PID_FILE)
+        st = os.stat(PID_FILE)
+    _pid_cache, _pid_cache_key = dict(pids), (st.st_mtime_ns, st.st_size)
+
+def clear_pids():
+    """Remove the PID file"""
+    global _pid_cache, _pid_cache_key
+    with pid_file_lock():
+        try:
+            PID_FILE.unlink()
+        except FileNotFoundError:
+            pass
+    _pid_cache, _pid_cache_key = None, None
 
 def is_process_running(pid: int) -> bool:
     """Check if a process is running"""
+    if not _IS_WINDOWS:
+        # Signal 0 only checks that the PID exists
+        try:
+            os.kill(pid, 0)
+            return True
+        except PermissionError:
+            return True  # Exists but owned by another user
+        except OSError:
+            return False
+
+    if _psutil is not None:
+        return _psutil.pid_exists(pid)
+    # Fallback if psutil not available
+    return _win_process_alive(pid)
+
+# Win32 process access rights / exit code (fallbacks used when psutil is missing)
+PROCESS_TERMINATE = 0x0001
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+SYNCHRONIZE = 0x00100000
+STILL_ACTIVE = 259
+
+@functools.lru_cache(maxsize=None)
+def _kernel32():
+    """kernel32 via ctypes, loaded on first use (Windows fallback paths only)
+
+    Prototypes are declared once here so HANDLEs stay pointer-sized on
+    64-bit instead of being truncated to the default C int.
+    """
+    import ctypes
+    from ctypes import wintypes
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    prototypes = {
+        "OpenProcess": ([wintypes.DWORD, wintypes.BOOL, wintypes.DWORD], wintypes.HANDLE),
+        "GetExitCodeProcess": ([wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD)], wintypes.BOOL),
+        "TerminateProcess": ([wintypes.HANDLE, wintypes.UINT], wintypes.BOOL),
+        "WaitForSingleObject": ([wintypes.HANDLE, wintypes.DWORD], wintypes.DWORD),
+        "CloseHandle": ([wintypes.HANDLE], wintypes.BOOL),
+    }
+    for name, (argtypes, restype) in prototypes.items():
+        function = getattr(kernel32, name)
+        function.argtypes = argtypes
+        function.restype = restype
+    return kernel32
+
+def _win_process_alive(pid: int) -> bool:
+    """Check a Windows PID with OpenProcess + GetExitCodeProcess (no tasklist spawn)"""
+    import ctypes
+    from ctypes import wintypes
+    kernel32 = _kernel32()
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        return False
     try:
-        import psutil
-        return psutil.pid_exists(pid)
-    except ImportError:
-        # Fallback if psutil not available
-        if platform.system() == "Windows":
-            try:
-                subprocess.check_output(
-                    ["tasklist", "/FI", f"PID eq {pid}"],
-                    stderr=subprocess.DEVNULL
-                )
-                return True
-            except subprocess.CalledProcessError:
-                return False
-        else:
-            try:
-                os.kill(pid, 0)
-                return True
-            except OSError:
-                return False
-
-def terminate_process(pid: int, timeout: int = 5) -> bool:
-    """Terminate a process gracefully, force kill if necessary"""
-    if not is_process_running(pid):
+        exit_code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            return False
+        return exit_code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+def _win_terminate_process(pid: int, timeout: int) -> bool:
+    """Kill a Windows process with TerminateProcess (no taskkill spawn)"""
+    kernel32 = _kernel32()
+    handle = kernel32.OpenProcess(PROCESS_TERMINATE | SYNCHRONIZE, False, pid)
+    if not handle:
+        return not _win_process_alive(pid)  # Already gone counts as stopped
+    try:
+        if not kernel32.TerminateProcess(handle, 1):
+            return False
+        kernel32.WaitForSingleObject(handle, int(timeout * 1000))
         return True
+    finally:
+        kernel32.CloseHandle(handle)
 
-    try:
-        import psutil
-        process = psutil.Process(pid)
-        process.terminate()
+def get_running_pids(pids: List[int]) -> set:
+    """Return the subset of pids that are running (one cheap probe per pid)
+
+    Callers probe once and pass the result on (see terminate_processes), so
+    each pid is checked a single time per command.
+    """
+    return {pid for pid in pids if is_process_running(pid)}
+
+def terminate_process(pid: int, timeout: int = 5, probed: bool = False) -> bool:
+    """Terminate a process gracefully, force kill if necessary
+
+    probed=True means the caller has just seen pid running, so the up-front
+    liveness probe is skipped.
+    """
+    if not probed and not is_process_running(pid):
+        return True
+
+    if _psutil is not None:
+        try:
+            process = _psutil.Process(pid)
+            process.terminate()
+        except _psutil.NoSuchProcess:
+            return True  # Exited since the probe
 
         # Wait for graceful shutdown
         try:
             process.wait(timeout=timeout)
             return True
-        except psutil.TimeoutExpired:
+        except _psutil.TimeoutExpired:
             # Force kill
             process.kill()
             process.wait(timeout=2)
             return True
-    except ImportError:
-        # Fallback without psutil
-        if platform.system() == "Windows":
-            try:
-                subprocess.check_call(
-                    ["taskkill", "/F", "/PID", str(pid)],
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
-                return True
-            except subprocess.CalledProcessError:
-                return False
-        else:
-            try:
-                os.kill(pid, 15)  # SIGTERM
-                time.sleep(timeout)
-                if is_process_running(pid):
+
+    # Fallback without psutil
+    if _IS_WINDOWS:
+        return _win_terminate_process(pid, timeout)
+    else:
+        try:
+            os.kill(pid, 15)  # SIGTERM
+            # Poll with the signal-0 probe instead of always sleeping the full timeout
+            deadline = time.monotonic() + timeout
+            while is_process_running(pid):
+                if time.monotonic() >= deadline:
                     os.kill(pid, 9)  # SIGKILL
-                return True
-            except OSError:
-                return False
+                    break
+                time.sleep(0.05)
+            return True
+        except ProcessLookupError:
+            return True  # Exited between probe and signal
+        except OSError:
+            return False
+
+def terminate_processes(pids: List[int], timeout: int = 5) -> Dict[int, bool]:
+    """Terminate several processes at once, force killing stragglers
+
+    pids are the ones get_running_pids() just reported, so they are not
+    probed again. With psutil all processes are signalled up front and
+    waited on together, so shutdown takes as long as the slowest process
+    rather than the sum.
+
+    Returns:
+        dict: pid -> whether the process was stopped
+    """
+    if _psutil is None:
+        return {pid: terminate_process(pid, timeout, probed=True) for pid in pids}
+
+    procs = []
+    results = {}
+    for pid in pids:
+        try:
+            proc = _psutil.Process(pid)
+            proc.terminate()
+            procs.append(proc)
+        except _psutil.NoSuchProcess:
+            results[pid] = True
+        except _psutil.Error:
+            results[pid] = False
+
+    _, alive = _psutil.wait_procs(procs, timeout=timeout)
+    for proc in alive:
+        try:
+            proc.kill()
+        except _psutil.NoSuchProcess:
+            pass
+    _, still_alive = _psutil.wait_procs(alive, timeout=2)
+
+    for proc in procs:
+        results[proc.pid] = proc not in still_alive
+    return results
+
+def _newest_log(log_dir: Path) -> Optional[Path]:
+    """Return the newest clawcat_*.log in log_dir, if any
+
+    Log names embed a zero-padded %Y%m%d_%H%M%S start time, so the newest
+    log is the greatest name: one scandir pass, no per-file stat. Names are
+    filtered with plain prefix/suffix compares rather than fnmatch.
+    """
+    newest = None
+    try:
+        with os.scandir(log_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith(LOG_PREFIX) and name.endswith(LOG_SUFFIX):
+                    if newest is None or name > newest.name:
+                        newest = entry
+    except OSError:
+        return None
+    return Path(newest.path) if newest else None
+
+def tail_lines(path: Path, count: int, max_bytes: int = 8192) -> str:
+    """Return the last count lines of a text file, reading at most max_bytes"""
+    try:
+        with open(path, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - max_bytes))
+            if size > max_bytes:
+                f.readline()  # Drop the partial first line
+            tail = deque(f, maxlen=count)
+    except OSError:
+        return ""
+    return b"".join(tail).decode('utf-8', errors='ignore').strip()
 
 def get_service_status() -> Dict:
     """Get status of all services"""
@@ -286,20 +535,16 @@ def get_service_status() -> Dict:
         "window": {"running": False, "pid": None}  # window includes server and frontend
     }
 
-    for service in ["window"]:
-        pid_key = f"{service}_pid"
-        if pid_key in pids:
-            pid = pids[pid_key]
-            if is_process_running(pid):
-                status[service]["running"] = True
-                status[service]["pid"] = pid
+    # Check all service PIDs in one batch
+    alive = get_running_pids([pids[f"{service}_pid"] for service in status if f"{service}_pid" in pids])
 
-    return status
+    for service in status:
+        pid = pids.get(f"{service}_pid")
+        if pid in alive:
+            status[service]["running"] = True
+            status[service]["pid"] = pid
 
-def is_service_running() -> bool:
-    """Check if any ClawCat service is running"""
-    status = get_service_status()
-    return any(s["running"] for s in status.values())
+    return status
 
 def start_services() -> Dict:
     """Start all ClawCat services"""
@@ -326,19 +571,19 @@ def start_services() -> Dict:
             print("\nok All services are already running")
             return {"success": False, "error": "All services already running"}
 
-    # Check environment (only Python is required now, Node.js only needed for building)
+    # Check environment (only Python is required; Node.js is only needed to build the frontend)
     env_check = check_environment()
     if not env_check["python"]:
-        for error in env_check["errors"]:
-            if "Python" in error:  # Only show Python errors
-                print(f"error {error}")
-        if not env_check["python"]:
-            return {"success": False, "errors": [e for e in env_check["errors"] if "Python" in e]}
+        python_errors = [e["msg"] for e in env_check["errors"] if e["kind"] == "python"]
+        print("\n".join(f"error {e}" for e in python_errors))
+        return {"success": False, "errors": python_errors}
 
-    # Install Python dependencies (always run once, pip will skip if already installed)
+    # Install Python dependencies, unless the shared deps marker says they were
+    # verified for this exact interpreter + requirements.txt recently
     # Note: Dependencies will also be installed by the launcher scripts if needed
-    print("Installing Python dependencies...")
-    if not install_python_deps():
+    if deps_marker_valid():
+        print("ok Python dependencies already installed")
+    elif not install_python_deps():
         print("⚠ Dependency installation failed, but continuing...")
         print("  The launcher script will attempt to install dependencies if needed")
 
@@ -350,9 +595,7 @@ def start_services() -> Dict:
             return {"success": False, "error": error}
 
     # Check if public/ exists and has index.html (frontend files should be in repository)
-    public_dir = PLUGIN_ROOT / "public"
-    index_html = public_dir / "index.html"
-    if not index_html.exists():
+    if not INDEX_HTML.exists():
         print("error Frontend files not found: public/index.html")
         print("  Frontend files should be provided in the repository.")
         return {"success": False, "error": "public/index.html not found"}
@@ -364,83 +607,90 @@ def start_services() -> Dict:
         # Start PyQt window (only if not already running)
         # Note: launch_window.py will start the HTTP server internally, which serves both API and frontend
         if not status.get("window", {}).get("running", False):
-            print("Starting ClawCat window...")
+            print("Starting ClawCat window...", flush=True)
             
             # Start window directly (conda environment should already be activated by launcher script)
-            window_script = PLUGIN_ROOT / "src" / "launch_window.py"
-            
-            if platform.system() == "Windows":
+            if _IS_WINDOWS:
                 # On Windows, use CREATE_NEW_PROCESS_GROUP to allow GUI window to show
                 # Don't use DETACHED_PROCESS so output can be seen in console
+                # The window creates WINDOW_READY_FILE once server + window are up
+                ensure_pid_dir()
+                WINDOW_READY_FILE.unlink(missing_ok=True)
                 window_process = subprocess.Popen(
-                    [sys.executable, str(window_script)],
+                    [sys.executable, str(LAUNCH_WINDOW_SCRIPT)],
                     creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
-                    cwd=str(PLUGIN_ROOT)
+                    cwd=str(PLUGIN_ROOT),
+                    env={**os.environ, READY_FILE_ENV: str(WINDOW_READY_FILE)}
                 )
+                # Returns early if the process dies
+                wait_for_ready_file(WINDOW_READY_FILE, window_process)
             else:
-                # On Unix-like systems, use normal process (output will go to console)
-                window_process = subprocess.Popen(
-                    [sys.executable, str(window_script)],
-                    cwd=str(PLUGIN_ROOT)
-                )
+                # On Unix-like systems, use normal process (stdout goes to console)
+                # The window writes one byte to the ready pipe once server + window are up;
+                # if it dies first, the pipe hits EOF and we notice immediately
+                # stderr goes to a file rather than a pipe: nothing has to drain it, it
+                # can't block the window or hit EPIPE later, and a crash's traceback is
+                # there to read back (the window's own log lines are in its log file)
+                LOG_DIR.mkdir(parents=True, exist_ok=True)
+                ready_r, ready_w = os.pipe()
+                try:
+                    with open(WINDOW_STDERR_LOG, 'wb') as stderr_file:
+                        window_process = subprocess.Popen(
+                            [sys.executable, str(LAUNCH_WINDOW_SCRIPT)],
+                            cwd=str(PLUGIN_ROOT),
+                            pass_fds=(ready_w,),
+                            env={**os.environ, READY_FD_ENV: str(ready_w)},
+                            stderr=stderr_file
+                        )
+                finally:
+                    os.close(ready_w)
+                if not wait_for_ready_signal(ready_r):
+                    # Either EOF (child exiting) or timeout (still starting): give it a moment to be reaped
+                    try:
+                        window_process.wait(timeout=1)
+                    except subprocess.TimeoutExpired:
+                        pass
             
-            # Wait a moment to check if process started successfully
-            time.sleep(1.0)
             if window_process.poll() is not None:
                 # Process exited immediately, get error
                 error_msg = "Window process exited immediately"
                 
                 # Try to read error from log file
-                log_dir = PID_FILE_DIR / "logs"
-                if log_dir.exists():
-                    log_files = sorted(log_dir.glob("clawcat_*.log"), key=lambda p: p.stat().st_mtime, reverse=True)
-                    if log_files:
-                        try:
-                            with open(log_files[0], 'r', encoding='utf-8', errors='ignore') as f:
-                                log_content = f.read()
-                                if log_content:
-                                    lines = log_content.strip().split('\n')
-                                    last_lines = '\n'.join(lines[-10:]) if len(lines) > 10 else log_content
-                                    error_msg = f"{error_msg}\nLast log entries:\n{last_lines}"
-                        except:
-                            pass
+                log_file = _newest_log(LOG_DIR)
+                if log_file:
+                    last_lines = tail_lines(log_file, 10)
+                    if last_lines:
+                        error_msg = f"{error_msg}\nLast log entries:\n{last_lines}"
                 
-                if platform.system() != "Windows":
-                    try:
-                        stderr_output = window_process.stderr.read().decode('utf-8', errors='ignore')
-                        if stderr_output:
-                            error_msg = f"{error_msg}\n{stderr_output}"
-                    except:
-                        pass
+                if not _IS_WINDOWS:
+                    stderr_output = tail_lines(WINDOW_STDERR_LOG, 20)
+                    if stderr_output:
+                        error_msg = f"{error_msg}\n{stderr_output}"
                 
                 print(f"error {error_msg}")
                 return {"success": False, "error": error_msg}
             
             pids["window_pid"] = window_process.pid
             # Get log file location (from launch_window.py)
-            log_dir = PID_FILE_DIR / "logs"
-            if log_dir.exists():
-                log_files = sorted(log_dir.glob("clawcat_*.log"), key=lambda p: p.stat().st_mtime, reverse=True)
-                if log_files:
-                    print(f"ok ClawCat window started (PID: {window_process.pid})")
-                    print(f"  Window should appear shortly...")
-                    print(f"  📝 Log file: {log_files[0]}")
-                else:
-                    print(f"ok ClawCat window started (PID: {window_process.pid})")
-                    print(f"  Window should appear shortly...")
-                    print(f"  📝 Log directory: {log_dir}")
+            log_file = _newest_log(LOG_DIR)
+            print(f"ok ClawCat window started (PID: {window_process.pid})")
+            print(f"  Window should appear shortly...")
+            if log_file:
+                print(f"  📝 Log file: {log_file}")
             else:
-                print(f"ok ClawCat window started (PID: {window_process.pid})")
-                print(f"  Window should appear shortly...")
-                print(f"  📝 Log directory: {log_dir}")
+                print(f"  📝 Log directory: {LOG_DIR}")
         else:
             # Window already running, use existing PID
             if "window_pid" in existing_pids:
                 pids["window_pid"] = existing_pids["window_pid"]
                 print(f"ok Using existing ClawCat window (PID: {existing_pids['window_pid']})")
 
-        # Save PIDs
-        write_pids(pids)
+        # Save PIDs; the window is already up, so a failure here is reported
+        # instead of tearing it down
+        try:
+            write_pids(pids)
+        except OSError as e:
+            print(f"⚠ Could not record PIDs in {PID_FILE}: {e}")
 
         print(f"\nok ClawCat started successfully!")
         print(f"  Server: http://localhost:{SERVER_PORT} (serves both API and frontend)")
@@ -468,21 +718,24 @@ def stop_services() -> bool:
 
     print("Stopping ClawCat services...")
 
-    # Stop window (includes server and frontend)
-    for service in ["window"]:
-        pid_key = f"{service}_pid"
-        if pid_key in pids:
-            pid = pids[pid_key]
-            if is_process_running(pid):
-                print(f"Stopping {service} (PID: {pid})...")
-                if terminate_process(pid):
-                    print(f"ok {service} stopped")
-                else:
-                    print(f"error Failed to stop {service}")
+    # Stop window (includes server and frontend); all services are stopped together
+    recorded = {service: pids[f"{service}_pid"] for service in ["window"] if f"{service}_pid" in pids}
+    alive = get_running_pids(list(recorded.values()))
+    running = {}
+    for service, pid in recorded.items():
+        if pid in alive:
+            print(f"Stopping {service} (PID: {pid})...")
+            running[service] = pid
+
+    stopped = terminate_processes(list(running.values()))
+    for service, pid in running.items():
+        if stopped.get(pid):
+            print(f"ok {service} stopped")
+        else:
+            print(f"error Failed to stop {service}")
 
     # Clean up PID file
-    if PID_FILE.exists():
-        PID_FILE.unlink()
+    clear_pids()
 
     print("\nok All ClawCat services stopped")
     return True
@@ -495,32 +748,57 @@ def main():
     command = sys.argv[1].lower()
 
     if command == "start":
-        result = start_services()
+        with buffered_stdout():
+            result = start_services()
         if not result["success"]:
             sys.exit(1)
 
         # Keep running to maintain MCP Server process
         # This allows Claude Code to manage the lifecycle
-        print("\n🐱 ClawCat is running. Press Ctrl+C to stop.")
-        try:
-            import signal
+        # stop_services runs exactly once, at interpreter exit, however we get there
+        import atexit
+        import signal
 
-            def signal_handler(sig, frame):
-                print("\n\nReceived interrupt signal, stopping services...")
-                stop_services()
-                sys.exit(0)
+        atexit.register(stop_services)
+        print("\n🐱 ClawCat is running. Press Ctrl+C to stop.")
 
-            signal.signal(signal.SIGINT, signal_handler)
-            signal.signal(signal.SIGTERM, signal_handler)
+        stop_event = threading.Event()
+        window_exited = threading.Event()
+        window_pid = result["pids"].get("window_pid")
 
-            # Keep the process alive
-            while True:
-                time.sleep(1)
+        def signal_handler(sig, frame):
+            stop_event.set()
 
-        except KeyboardInterrupt:
-            print("\n\nStopping services...")
-            stop_services()
-            sys.exit(0)
+        def child_handler(sig, frame):
+            # Reap exited children; stop if it was the window we launched
+            try:
+                while True:
+                    pid, _ = os.waitpid(-1, os.WNOHANG)
+                    if pid == 0:
+                        break
+                    if pid == window_pid:
+                        window_exited.set()
+                        stop_event.set()
+            except ChildProcessError:
+                pass
+
+        signal.signal(signal.SIGINT, signal_handler)
+        signal.signal(signal.SIGTERM, signal_handler)
+        if hasattr(signal, "SIGCHLD"):
+            signal.signal(signal.SIGCHLD, child_handler)
+            child_handler(signal.SIGCHLD, None)  # Catch an exit that raced the install
+
+        # Sleep until a signal arrives. Windows can't interrupt an untimed
+        # wait, so wake up once a second there to let Ctrl+C through.
+        wait_timeout = None if hasattr(signal, "SIGCHLD") else 1.0
+        while not stop_event.wait(wait_timeout):
+            pass
+
+        if window_exited.is_set():
+            print("\n\nClawCat window exited, cleaning up...")
+        else:
+            print("\n\nReceived interrupt signal, stopping services...")
+        sys.exit(0)
 
     elif command == "stop":
         stop_services()
@@ -5,11 +5,25 @@ ClawCat Window Launcher - PyQt5 版本
 """
 import sys
 import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from pathlib import Path
 from datetime import datetime
-from PyQt5.QtCore import Qt, QUrl, QPoint, pyqtSignal, QObject
+
+# Chromium 渲染参数（必须在导入 PyQt5.QtWebEngine 之前设置，仅 Windows）
+# 透明窗口在 Windows 上会退回到 CPU 光栅化导致卡顿，改用 GPU 光栅化并保留 GPU 合成；
+# 不绕过 Chromium 的 GPU 黑名单，已知有问题的驱动仍走软件路径。
+# 用户自行设置的 QTWEBENGINE_CHROMIUM_FLAGS 优先
+if sys.platform == "win32":
+    os.environ.setdefault("QTWEBENGINE_CHROMIUM_FLAGS", "--enable-gpu-rasterization --enable-zero-copy")
+
+from PyQt5.QtCore import Qt, QUrl, QPoint, QTimer, pyqtSignal, QObject, qInstallMessageHandler
+from PyQt5.QtCore import QtDebugMsg, QtInfoMsg, QtWarningMsg, QtCriticalMsg, QtFatalMsg
 from PyQt5.QtWidgets import QApplication, QMenu, QAction, QSystemTrayIcon
-from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineSettings
+from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineSettings, QWebEngineProfile
 from PyQt5.QtGui import QScreen, QColor, QIcon
 
 # 日志文件配置
@@ -17,40 +31,49 @@ LOG_DIR = Path.home() / ".claude" / "clawcat" / "logs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_FILE = LOG_DIR / f"clawcat_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
 
-# 设置日志文件
-class TeeOutput:
-    """同时输出到文件和控制台"""
-    def __init__(self, file_path, stream):
-        self.file = open(file_path, 'w', encoding='utf-8', errors='replace')
-        self.stream = stream
-        self.isatty = stream.isatty if hasattr(stream, 'isatty') else lambda: False
-    
-    def write(self, text):
-        try:
-            self.stream.write(text)
-            self.file.write(text)
-            self.file.flush()
-        except:
-            pass  # 忽略写入错误
-    
-    def flush(self):
-        try:
-            self.stream.flush()
-            self.file.flush()
-        except:
-            pass
-    
-    def close(self):
-        try:
-            self.file.close()
-        except:
-            pass
-
-# 保存原始 stderr
-_original_stderr = sys.stderr
-
-# 重定向 stderr 到日志文件和控制台
-sys.stderr = TeeOutput(LOG_FILE, _original_stderr)
+# 日志：写入轮转的日志文件，同时输出到控制台
+log = logging.getLogger("clawcat")
+log.setLevel(logging.INFO)
+_file_handler = RotatingFileHandler(LOG_FILE, maxBytes=1_000_000, backupCount=3, encoding='utf-8', delay=True)  # 首次写入时才创建文件
+_file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+log.addHandler(_file_handler)
+# 控制台输出先缓冲：攒满 64 条、出现 WARNING 及以上或定时器触发时才写 stderr
+_console_buffer = MemoryHandler(64, flushLevel=logging.WARNING, target=logging.StreamHandler(sys.stderr))
+log.addHandler(_console_buffer)
+CONSOLE_FLUSH_INTERVAL_MS = 1000
+
+def _log_uncaught_exception(exc_type, exc_value, exc_traceback):
+    """未捕获的异常也写入日志文件（service_manager 启动失败时会读取日志末尾）"""
+    if issubclass(exc_type, KeyboardInterrupt):
+        sys.__excepthook__(exc_type, exc_value, exc_traceback)
+        return
+    log.critical("Uncaught exception", exc_info=(exc_type, exc_value, exc_traceback))
+
+sys.excepthook = _log_uncaught_exception
+
+def _log_uncaught_thread_exception(args):
+    """后台线程（服务器工作线程等）中未捕获的异常同样写入日志文件"""
+    if issubclass(args.exc_type, SystemExit):
+        return
+    thread_name = args.thread.name if args.thread is not None else "?"
+    log.critical("Uncaught exception in thread %s", thread_name,
+                 exc_info=(args.exc_type, args.exc_value, args.exc_traceback))
+
+threading.excepthook = _log_uncaught_thread_exception
+
+# Qt 自身的警告（qWarning 等）默认只写 stderr，转到日志
+_QT_LOG_LEVELS = {
+    QtDebugMsg: logging.DEBUG,
+    QtInfoMsg: logging.INFO,
+    QtWarningMsg: logging.WARNING,
+    QtCriticalMsg: logging.ERROR,
+    QtFatalMsg: logging.CRITICAL,
+}
+
+def _log_qt_message(msg_type, context, message):
+    log.log(_QT_LOG_LEVELS.get(msg_type, logging.WARNING), "[Qt] %s", message)
+
+qInstallMessageHandler(_log_qt_message)
 
 # 导入同目录下的 server 模块
 try:
@@ -62,17 +85,23 @@ except ImportError:
 # 统一使用服务器 URL（server 会提供前端文件）
 FRONTEND_URL = 'http://localhost:22622/'
 
-# 获取资源文件路径（支持打包和开发模式）
-def get_resource_path(relative_path):
-    """获取资源文件路径（支持打包和开发模式）"""
-    if getattr(sys, 'frozen', False):
-        # 打包模式：从临时目录或 exe 所在目录
-        base_path = Path(sys.executable).parent
-    else:
-        # 开发模式：从项目根目录
-        base_path = Path(__file__).parent.parent
-    
-    return base_path / relative_path
+# 资源文件根目录（支持打包和开发模式）
+if getattr(sys, 'frozen', False):
+    # 打包模式：exe 所在目录
+    _BASE_PATH = Path(sys.executable).parent
+else:
+    # 开发模式：项目根目录
+    _BASE_PATH = Path(__file__).parent.parent
+
+# 托盘图标：按优先级取第一个存在的文件（启动时查找一次）
+_ICON_PATH = next(
+    (_BASE_PATH / p for p in ("icon.ico", "public/logo.png", "logo.png") if (_BASE_PATH / p).exists()),
+    None
+)
+
+# 前端资源的持久化缓存目录（跨启动复用 JS/模型文件，避免每次重新拉取）
+WEB_CACHE_DIR = Path.home() / ".claude" / "clawcat" / "webcache"
+WEB_CACHE_MAX_SIZE = 200 * 1024 * 1024  # 200 MB
 
 # 根据 cover.png 的实际比例设置窗口尺寸
 # cover.png: 612x354, 比例 1.73:1
@@ -103,17 +132,24 @@ class TransparentWebView(QWebEngineView):
         import platform
         if platform.system() == 'Darwin':
             # macOS: 使用 Qt.Window 保持窗口稳定可见
-            self.setWindowFlags(
+            self._flags = (
                 Qt.FramelessWindowHint |  # 无边框
                 Qt.WindowStaysOnTopHint   # 置顶
             )
         else:
             # Windows: 使用 Qt.Tool 隐藏任务栏图标
-            self.setWindowFlags(
+            self._flags = (
                 Qt.FramelessWindowHint |  # 无边框
                 Qt.WindowStaysOnTopHint |  # 置顶
                 Qt.Tool  # 不显示在任务栏
             )
+        self.setWindowFlags(self._flags)
+
+        # 缓存屏幕可用区域，屏幕变化时刷新
+        self._screen = QApplication.primaryScreen()
+        self._screen_geom = self._screen.availableGeometry()
+        self._screen.availableGeometryChanged.connect(self._on_screen_geometry_changed)
+        self._screen_signal_connected = False
 
         # 设置透明背景（关键！）
         self.setAttribute(Qt.WA_TranslucentBackground)
@@ -121,11 +157,6 @@ class TransparentWebView(QWebEngineView):
         # 设置网页背景透明（关键！）
         self.page().setBackgroundColor(QColor(0, 0, 0, 0))  # 完全透明
 
-        # 启用透明背景支持
-        settings = self.settings()
-        settings.setAttribute(QWebEngineSettings.ShowScrollBars, False)
-        settings.setAttribute(QWebEngineSettings.LocalContentCanAccessFileUrls, True)
-
         # 设置窗口大小
         self.resize(WINDOW_WIDTH, WINDOW_HEIGHT)
 
@@ -135,17 +166,40 @@ class TransparentWebView(QWebEngineView):
         # 拖动相关
         self.drag_position = None
         self.dragging = False
+        # 合并高频鼠标移动：只保留最新目标位置，每轮事件循环最多 move 一次
+        self._pending_pos = None
+        self._move_scheduled = False
+        self._last_applied_pos = QPoint(-1, -1)  # 窗口当前位置（由 moveEvent 维护）
 
-        # 设置鼠标跟踪，确保能捕获所有鼠标移动事件
-        self.setMouseTracking(True)
+        # 右键菜单
+        self._build_context_menu()
 
     def showEvent(self, event):
         """窗口显示时设置 macOS 特定属性"""
         super().showEvent(event)
+        # windowHandle() 在首次显示后才存在
+        if not self._screen_signal_connected and self.windowHandle() is not None:
+            self.windowHandle().screenChanged.connect(self._on_screen_changed)
+            self._screen_signal_connected = True
+            if self.windowHandle().screen() is not self._screen:
+                self._on_screen_changed(self.windowHandle().screen())
         import platform
         if platform.system() == 'Darwin':
             self._set_macos_all_spaces()
 
+    def _on_screen_changed(self, screen):
+        """窗口移动到其他屏幕时更新缓存的屏幕区域"""
+        if screen is None:
+            return
+        self._screen.availableGeometryChanged.disconnect(self._on_screen_geometry_changed)
+        self._screen = screen
+        self._screen.availableGeometryChanged.connect(self._on_screen_geometry_changed)
+        self._screen_geom = screen.availableGeometry()
+
+    def _on_screen_geometry_changed(self, geometry):
+        """屏幕可用区域变化（分辨率、任务栏）时更新缓存"""
+        self._screen_geom = geometry
+
     def _set_macos_all_spaces(self):
         """设置窗口在所有 macOS 桌面/空间可见"""
         try:
@@ -200,16 +254,17 @@ class TransparentWebView(QWebEngineView):
                     # 设置浮动窗口级别 (NSFloatingWindowLevel = 3)
                     msgSend_int(window, sel_setLevel, 3)
 
-            print(f"[macOS] Window set to appear on all spaces (ctypes)", file=sys.stderr, flush=True)
+            log.info("[macOS] Window set to appear on all spaces (ctypes)")
 
         except Exception as e:
-            print(f"[macOS] Failed to set all-spaces: {e}", file=sys.stderr, flush=True)
+            log.warning("[macOS] Failed to set all-spaces: %s", e)
 
     def mousePressEvent(self, event):
         """鼠标按下事件 - 用于拖动窗口"""
         # 左键按下时开始拖动
         if event.button() == Qt.LeftButton:
-            self.drag_position = event.globalPos() - self.frameGeometry().topLeft()
+            # 无边框窗口的 frame 与客户区原点一致，pos() 无需查询窗口管理器
+            self.drag_position = event.globalPos() - self.pos()
             self.dragging = True
             # 设置鼠标捕获，确保能接收到所有鼠标事件
             self.setCursor(Qt.ClosedHandCursor)
@@ -219,13 +274,30 @@ class TransparentWebView(QWebEngineView):
     
     def mouseMoveEvent(self, event):
         """鼠标移动事件 - 拖动窗口"""
-        # 如果正在拖动，移动窗口
-        if self.dragging and event.buttons() == Qt.LeftButton and self.drag_position:
-            new_pos = event.globalPos() - self.drag_position
-            self.move(new_pos)
+        # 如果正在拖动，移动窗口（按下时已设置 drag_position，释放时一并清除）
+        if self.dragging:
+            self._pending_pos = event.globalPos() - self.drag_position
+            if not self._move_scheduled:
+                self._move_scheduled = True
+                QTimer.singleShot(0, self._flush_move)
             event.accept()
             return
         super().mouseMoveEvent(event)
+
+    def _flush_move(self):
+        """应用最新的拖动位置（排队中的鼠标事件处理完后执行）"""
+        self._move_scheduled = False
+        pos, self._pending_pos = self._pending_pos, None
+        # 位置没有变化时跳过，避免无意义的窗口管理器调用和重绘
+        if pos is None or pos == self._last_applied_pos:
+            return
+        self._last_applied_pos = pos
+        self.move(pos)
+
+    def moveEvent(self, event):
+        """记录窗口位置（包括 resize_window / safe_move 等非拖动移动）"""
+        self._last_applied_pos = event.pos()
+        super().moveEvent(event)
     
     def mouseReleaseEvent(self, event):
         """鼠标释放事件"""
@@ -238,32 +310,19 @@ class TransparentWebView(QWebEngineView):
             return
         super().mouseReleaseEvent(event)
     
-    def contextMenuEvent(self, event):
-        """右键菜单事件"""
+    # 右键菜单中的大小选项：(缩放比例, 显示文本)
+    SIZE_OPTIONS = [(0.5, "50%"), (0.75, "75%"), (1.0, "100%"), (1.25, "125%"), (1.5, "150%"), (2.0, "200%")]
+
+    def _build_context_menu(self):
+        """创建右键菜单（只创建一次，每次右键时复用）"""
         menu = QMenu(self)
         
         # 大小调整选项
         size_menu = menu.addMenu("大小")
-        size_50 = QAction("50%", self)
-        size_75 = QAction("75%", self)
-        size_100 = QAction("100%", self)
-        size_125 = QAction("125%", self)
-        size_150 = QAction("150%", self)
-        size_200 = QAction("200%", self)
-        
-        size_50.triggered.connect(lambda: self.resize_window(0.5))
-        size_75.triggered.connect(lambda: self.resize_window(0.75))
-        size_100.triggered.connect(lambda: self.resize_window(1.0))
-        size_125.triggered.connect(lambda: self.resize_window(1.25))
-        size_150.triggered.connect(lambda: self.resize_window(1.5))
-        size_200.triggered.connect(lambda: self.resize_window(2.0))
-        
-        size_menu.addAction(size_50)
-        size_menu.addAction(size_75)
-        size_menu.addAction(size_100)
-        size_menu.addAction(size_125)
-        size_menu.addAction(size_150)
-        size_menu.addAction(size_200)
+        for scale, label in self.SIZE_OPTIONS:
+            action = QAction(label, self)
+            action.triggered.connect(partial(self.resize_window, scale))
+            size_menu.addAction(action)
         
         menu.addSeparator()
         
@@ -272,10 +331,10 @@ class TransparentWebView(QWebEngineView):
         minimize_action.triggered.connect(self.showMinimized)
         menu.addAction(minimize_action)
         
-        # 置顶切换
-        topmost_action = QAction("取消置顶" if self.windowFlags() & Qt.WindowStaysOnTopHint else "置顶", self)
-        topmost_action.triggered.connect(self.toggle_topmost)
-        menu.addAction(topmost_action)
+        # 置顶切换（文本在每次弹出时更新）
+        self._topmost_action = QAction(self)
+        self._topmost_action.triggered.connect(self.toggle_topmost)
+        menu.addAction(self._topmost_action)
         
         menu.addSeparator()
         
@@ -284,37 +343,75 @@ class TransparentWebView(QWebEngineView):
         exit_action.triggered.connect(self.close)
         menu.addAction(exit_action)
         
-        menu.exec_(event.globalPos())
+        self._ctx_menu = menu
+
+    def contextMenuEvent(self, event):
+        """右键菜单事件"""
+        self._topmost_action.setText("取消置顶" if self._flags & Qt.WindowStaysOnTopHint else "置顶")
+        self._ctx_menu.exec_(event.globalPos())
     
     def resize_window(self, scale):
         """调整窗口大小，保持右边和下边贴着桌面边缘"""
         new_width = int(DEFAULT_MODEL_WIDTH * scale)
         new_height = int(DEFAULT_MODEL_HEIGHT * scale)
         
-        # 获取屏幕尺寸
-        screen = QApplication.primaryScreen()
-        screen_geometry = screen.availableGeometry()
+        # 窗口当前所在屏幕的可用区域（缓存值，随 screenChanged 更新）
+        screen_geometry = self._screen_geom
         
-        # 计算新位置：右边和下边贴着屏幕边缘
-        new_x = screen_geometry.width() - new_width - 5  # 右边留 5px 边距
-        new_y = screen_geometry.height() - new_height - 5  # 下边留 5px 边距
+        # 计算新位置：右边和下边贴着屏幕边缘（加上屏幕原点，副屏的原点不为 0）
+        new_x = screen_geometry.x() + screen_geometry.width() - new_width - 5  # 右边留 5px 边距
+        new_y = screen_geometry.y() + screen_geometry.height() - new_height - 5  # 下边留 5px 边距
         
         # 先调整大小，再移动位置
         self.resize(new_width, new_height)
         self.move(new_x, new_y)
         
-        print(f"[Window] Resized to {new_width}x{new_height} (scale: {scale})", file=sys.stderr, flush=True)
-        print(f"[Window] Position: ({new_x}, {new_y}) - Right and bottom aligned", file=sys.stderr, flush=True)
+        log.info("[Window] Resized to %dx%d (scale: %s)", new_width, new_height, scale)
+        log.info("[Window] Position: (%d, %d) - Right and bottom aligned", new_x, new_y)
     
     def toggle_topmost(self):
         """切换置顶状态"""
-        if self.windowFlags() & Qt.WindowStaysOnTopHint:
-            self.setWindowFlags(self.windowFlags() & ~Qt.WindowStaysOnTopHint)
-            print("[Window] Topmost disabled", file=sys.stderr, flush=True)
-        else:
-            self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
-            print("[Window] Topmost enabled", file=sys.stderr, flush=True)
-        self.show()  # 重新显示窗口以应用标志
+        self._flags ^= Qt.WindowStaysOnTopHint
+        topmost = bool(self._flags & Qt.WindowStaysOnTopHint)
+        # 优先直接修改原生窗口层级；setWindowFlags 会销毁并重建原生窗口（包括 Chromium 渲染层）
+        if not self._set_native_topmost(topmost):
+            self.setWindowFlags(self._flags)
+            self.show()  # 重新显示窗口以应用标志
+        log.info("[Window] Topmost %s", "enabled" if topmost else "disabled")
+
+    def _set_native_topmost(self, topmost):
+        """通过平台 API 设置置顶，成功返回 True（Windows: SetWindowPos，macOS: NSWindow.setLevel:）"""
+        import platform
+        system = platform.system()
+        try:
+            import ctypes
+            if system == 'Windows':
+                HWND_TOPMOST, HWND_NOTOPMOST = -1, -2
+                SWP_NOSIZE, SWP_NOMOVE, SWP_NOACTIVATE = 0x0001, 0x0002, 0x0010
+                user32 = ctypes.windll.user32
+                user32.SetWindowPos.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int, ctypes.c_int,
+                                                ctypes.c_int, ctypes.c_int, ctypes.c_uint]
+                return bool(user32.SetWindowPos(
+                    int(self.winId()), HWND_TOPMOST if topmost else HWND_NOTOPMOST,
+                    0, 0, 0, 0, SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE
+                ))
+            if system == 'Darwin':
+                import ctypes.util
+                objc = ctypes.cdll.LoadLibrary(ctypes.util.find_library('objc'))
+                objc.sel_registerName.restype = ctypes.c_void_p
+                objc.sel_registerName.argtypes = [ctypes.c_char_p]
+                msg_send = ctypes.CFUNCTYPE(ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p)(('objc_msgSend', objc))
+                msg_send_long = ctypes.CFUNCTYPE(ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_long)(('objc_msgSend', objc))
+                # winId() 在 macOS 上是 NSView*
+                ns_window = msg_send(int(self.winId()), objc.sel_registerName(b'window'))
+                if not ns_window:
+                    return False
+                # NSFloatingWindowLevel = 3, NSNormalWindowLevel = 0
+                msg_send_long(ns_window, objc.sel_registerName(b'setLevel:'), 3 if topmost else 0)
+                return True
+        except Exception as e:
+            log.warning("[Window] Native topmost toggle failed: %s", e)
+        return False
 
     def _do_move(self, x, y):
         """实际执行窗口移动（在主线程中）"""
@@ -325,38 +422,78 @@ class TransparentWebView(QWebEngineView):
         self.move_signal.emit(x, y)
 
 
-def position_window_bottom_right(window):
-    """将窗口定位到屏幕右下角"""
-    screen = QApplication.primaryScreen()
-    screen_geometry = screen.availableGeometry()
-    
-    x = screen_geometry.width() - window.width() - 5
-    y = screen_geometry.height() - window.height() - 5
+def configure_web_profile():
+    """配置默认 WebEngine profile（所有页面共享，创建窗口前调用一次）"""
+    profile = QWebEngineProfile.defaultProfile()
+
+    # 启用磁盘 HTTP 缓存（必须在页面加载之前配置）
+    profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+    profile.setCachePath(str(WEB_CACHE_DIR / "cache"))
+    profile.setPersistentStoragePath(str(WEB_CACHE_DIR / "storage"))
+    profile.setHttpCacheMaximumSize(WEB_CACHE_MAX_SIZE)
+
+    # 页面设置（profile 级别，页面继承）
+    settings = profile.settings()
+    settings.setAttribute(QWebEngineSettings.ShowScrollBars, False)
+    settings.setAttribute(QWebEngineSettings.LocalContentCanAccessFileUrls, True)
+
+
+def position_window_bottom_right(window, screen_geometry):
+    """将窗口定位到屏幕右下角（在 show() 之前调用，一次 setGeometry 完成移动和缩放）"""
+    width, height = window.width(), window.height()
+    x = screen_geometry.x() + screen_geometry.width() - width - 5
+    y = screen_geometry.y() + screen_geometry.height() - height - 5
     
-    window.move(x, y)
+    window.setGeometry(x, y, width, height)
+
+
+def notify_ready():
+    """通知 service_manager 服务器和窗口已就绪
+    （写入 CLAWCAT_READY_FD 管道；Windows 上无法传递 fd，改为创建 CLAWCAT_READY_FILE 文件）"""
+    fd = int(os.environ.pop("CLAWCAT_READY_FD", "-1"))
+    ready_file = os.environ.pop("CLAWCAT_READY_FILE", None)
+    try:
+        if fd >= 0:
+            os.write(fd, b"1")
+            os.close(fd)
+        if ready_file:
+            Path(ready_file).touch()
+    except OSError as e:
+        log.warning("⚠ Failed to signal readiness: %s", e)
 
 
 def main():
     """主函数"""
-    print("=" * 50, file=sys.stderr)
-    print("  ClawCat Window Launcher (PyQt5)", file=sys.stderr)
-    print("=" * 50, file=sys.stderr)
-    print(f"📝 Log file: {LOG_FILE}", file=sys.stderr, flush=True)
-    
-    # 启动后端服务器
-    print("Starting ClawCat server on port 22622...", file=sys.stderr, flush=True)
-    server, server_thread = start_server()
-    print("✅ Server started successfully", file=sys.stderr, flush=True)
+    log.info("=" * 50)
+    log.info("  ClawCat Window Launcher (PyQt5)")
+    log.info("=" * 50)
+    log.info("📝 Log file: %s", LOG_FILE)
     
-    # 创建 Qt 应用
-    app = QApplication(sys.argv)
-    app.setQuitOnLastWindowClosed(False)  # 关闭窗口时不退出应用
+    # 启动后端服务器（在后台线程中绑定端口，与 QApplication 初始化并行）
+    log.info("Starting ClawCat server on port 22622...")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        server_future = executor.submit(start_server)
+        
+        # 创建 Qt 应用
+        app = QApplication(sys.argv)
+        app.setQuitOnLastWindowClosed(False)  # 关闭窗口时不退出应用
+        
+        # 定时把缓冲的控制台日志写出，空闲时日志最多延迟一秒
+        console_flush_timer = QTimer()
+        console_flush_timer.timeout.connect(_console_buffer.flush)
+        console_flush_timer.start(CONSOLE_FLUSH_INTERVAL_MS)
+        
+        # 窗口创建时就会加载前端页面，此前服务器必须已经就绪（启动失败时在此抛出异常）
+        server, server_thread = server_future.result()
+    log.info("✅ Server started successfully")
     
     # 创建透明窗口（无论是否有系统托盘都需要）
-    print("Creating transparent window...", file=sys.stderr, flush=True)
+    log.info("Creating transparent window...")
+    configure_web_profile()
     window = TransparentWebView()
-    position_window_bottom_right(window)
+    position_window_bottom_right(window, window._screen_geom)
     window.show()
+    notify_ready()
 
     # 注册窗口移动回调（用于前端拖拽）
     try:
@@ -364,31 +501,20 @@ def main():
         def move_window_callback(x, y):
             window.safe_move(x, y)  # 使用线程安全的方法
         server_state.window_move_callback = move_window_callback
-        print("✅ Window move callback registered", file=sys.stderr, flush=True)
+        log.info("✅ Window move callback registered")
     except Exception as e:
-        print(f"⚠ Failed to register window move callback: {e}", file=sys.stderr, flush=True)
+        log.warning("⚠ Failed to register window move callback: %s", e)
     
     # 创建系统托盘图标
     tray = None
     if QSystemTrayIcon.isSystemTrayAvailable():
-        # 查找图标文件
-        icon_paths = [
-            get_resource_path("icon.ico"),
-            get_resource_path("public/logo.png"),
-            get_resource_path("logo.png"),
-        ]
-        
-        tray_icon = None
-        for icon_path in icon_paths:
-            if icon_path.exists():
-                tray_icon = QIcon(str(icon_path))
-                print(f"✅ Using tray icon: {icon_path}", file=sys.stderr, flush=True)
-                break
-        
-        if tray_icon is None:
+        if _ICON_PATH:
+            tray_icon = QIcon(str(_ICON_PATH))
+            log.info("✅ Using tray icon: %s", _ICON_PATH)
+        else:
             # 使用默认图标
             tray_icon = QIcon()
-            print("⚠ No icon found, using default", file=sys.stderr, flush=True)
+            log.warning("⚠ No icon found, using default")
         
         # 创建系统托盘
         tray = QSystemTrayIcon(app)
@@ -430,31 +556,27 @@ def main():
         
         # 显示托盘图标
         tray.show()
-        print("✅ System tray icon created", file=sys.stderr, flush=True)
+        log.info("✅ System tray icon created")
     else:
-        print("⚠ System tray is not available", file=sys.stderr, flush=True)
+        log.warning("⚠ System tray is not available")
     
-    print("Launching window...", file=sys.stderr, flush=True)
-    print(f"  URL: {FRONTEND_URL}", file=sys.stderr, flush=True)
-    print(f"  Size: {WINDOW_WIDTH}x{WINDOW_HEIGHT}", file=sys.stderr, flush=True)
-    print(f"  Position: Bottom-right corner", file=sys.stderr, flush=True)
-    print(f"  Frameless: Yes", file=sys.stderr, flush=True)
-    print(f"  Transparent: Yes", file=sys.stderr, flush=True)
-    print(f"  Taskbar: Hidden (System tray only)", file=sys.stderr, flush=True)
-    print(f"\n💡 Click tray icon to show/hide window", file=sys.stderr, flush=True)
-    print(f"💡 Right-click tray icon for menu", file=sys.stderr, flush=True)
-    print(f"📝 Logs: {LOG_FILE}\n", file=sys.stderr, flush=True)
+    log.info("Launching window...")
+    log.info("  URL: %s", FRONTEND_URL)
+    log.info("  Size: %dx%d", WINDOW_WIDTH, WINDOW_HEIGHT)
+    log.info("  Position: Bottom-right corner")
+    log.info("  Frameless: Yes")
+    log.info("  Transparent: Yes")
+    log.info("  Taskbar: Hidden (System tray only)")
+    log.info("\n💡 Click tray icon to show/hide window")
+    log.info("💡 Right-click tray icon for menu")
+    log.info("📝 Logs: %s\n", LOG_FILE)
     
     # 运行应用
     try:
         sys.exit(app.exec_())
     except KeyboardInterrupt:
-        print("\nShutting down...", file=sys.stderr, flush=True)
+        log.info("\nShutting down...")
         server.shutdown()
-    finally:
-        # 关闭日志文件
-        if hasattr(sys.stderr, 'close'):
-            sys.stderr.close()
 
 
 if __name__ == "__main__":
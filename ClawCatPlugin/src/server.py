@@ -3,33 +3,62 @@
 ClawCat Server - Pure Python HTTP server
 Cross-platform support: Windows & macOS
 """
+import hashlib
 import json
+import logging
 import os
 import sys
 import subprocess
 import platform
+import queue
+import re
+import shutil
+import socket
 from pathlib import Path
-from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse
+from http.server import HTTPServer, BaseHTTPRequestHandler
+import itertools
 import threading
 import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
 from datetime import datetime
 
+try:
+    import psutil as _psutil
+except ImportError:
+    _psutil = None
+
+# JSON for hook payloads/responses: orjson when available (parses bytes directly)
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+# Logs go through the "clawcat" logger configured by launch_window
+# (or by __main__ below when the server runs on its own)
+log = logging.getLogger("clawcat.server")
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 # ============================================================================
 # Platform Detection & Window Control Import
 # ============================================================================
 PLATFORM = platform.system()  # 'Windows', 'Darwin', 'Linux'
-print(f"[Platform] Detected: {PLATFORM}", file=sys.stderr, flush=True)
+log.info("[Platform] Detected: %s", PLATFORM)
 
 try:
     if PLATFORM == 'Darwin':  # macOS
-        print(f"[Platform] Loading macOS window control", file=sys.stderr, flush=True)
+        log.info("[Platform] Loading macOS window control")
         try:
             from .window_control_mac import minimize_window, restore_window, activate_window, set_window_topmost
         except ImportError:
             from window_control_mac import minimize_window, restore_window, activate_window, set_window_topmost
     elif PLATFORM == 'Windows':
-        print(f"[Platform] Loading Windows window control", file=sys.stderr, flush=True)
+        log.info("[Platform] Loading Windows window control")
         try:
             from .window_control import minimize_window, restore_window, activate_window, set_window_topmost
         except ImportError:
@@ -37,12 +66,39 @@ try:
     else:
         raise ImportError(f"Unsupported platform: {PLATFORM}")
 except ImportError as e:
-    print(f"Warning: window control not available ({e}), window control disabled", file=sys.stderr, flush=True)
+    log.warning("Warning: window control not available (%s), window control disabled", e)
     def minimize_window(pid): return False
     def restore_window(pid): return False
     def activate_window(pid): return False
     def set_window_topmost(pid, topmost=True): return False
 
+# Terminal helpers for send_command_to_terminal, resolved once (Windows only)
+if PLATFORM == 'Windows':
+    WT_EXE = shutil.which("wt.exe") or "wt.exe"
+    POWERSHELL_EXE = shutil.which("powershell.exe") or "powershell.exe"
+    # Keep the helper PowerShell console hidden
+    HIDDEN_STARTUPINFO = subprocess.STARTUPINFO()
+    HIDDEN_STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    HIDDEN_STARTUPINFO.wShowWindow = 0  # SW_HIDE
+else:
+    WT_EXE = POWERSHELL_EXE = HIDDEN_STARTUPINFO = None
+
+# Identical window operations on the same PID closer together than this are
+# dropped (reported as successful) before they reach the window search
+WINDOW_OP_DEBOUNCE = 0.05
+_last_window_ops = {}
+_last_window_ops_lock = threading.Lock()
+
+def debounced_window_op(func, pid, *args):
+    """Call func(pid, *args) unless the same call started less than WINDOW_OP_DEBOUNCE ago"""
+    key = (func.__name__, pid, args)
+    now = time.monotonic()
+    with _last_window_ops_lock:
+        if now - _last_window_ops.get(key, float('-inf')) < WINDOW_OP_DEBOUNCE:
+            return True
+        _last_window_ops[key] = now
+    return func(pid, *args)
+
 # ============================================================================
 # Configuration
 # ============================================================================
@@ -59,37 +115,232 @@ else:
 # Frontend files location (all in public directory)
 FRONTEND_PUBLIC = STATIC_DIR / "public"
 
-# File cache for static files (in-memory cache)
+# Content-hashed build assets, e.g. index-ClUHVb8H.js
+HASHED_ASSET_RE = re.compile(r"-[A-Za-z0-9_-]{8,}\.(?:js|css)$")
+
+# Diagnostics: CLAWCAT_DEBUG=1 turns on every topic, or pick topics with a
+# comma-separated list (window, hooks). "hooks" dumps full hook
+# payloads/responses on stderr.
+_DEBUG_TOPICS = {t.strip() for t in os.environ.get("CLAWCAT_DEBUG", "").lower().split(",")}
+DEBUG_HOOKS = bool(_DEBUG_TOPICS & {"1", "hooks"})
+
+# Terminal process names by PID: pid -> (lowercase name, monotonic lookup time)
+PROC_NAME_TTL = 30.0
+_proc_name_cache = {}
+
+def get_process_name(pid):
+    """Lowercase process name for pid, cached for PROC_NAME_TTL seconds
+
+    Returns None when psutil is unavailable; psutil errors propagate.
+    """
+    if _psutil is None:
+        return None
+    cached = _proc_name_cache.get(pid)
+    now = time.monotonic()
+    if cached and now - cached[1] < PROC_NAME_TTL:
+        return cached[0]
+    name = _psutil.Process(pid).name().lower()
+    _proc_name_cache[pid] = (name, now)
+    return name
+
+def debug_hook(label, data):
+    """Write one compact JSON line for a hook payload/response when DEBUG_HOOKS is on"""
+    if DEBUG_HOOKS:
+        log.info("[%s] %s", label, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+
+# Content types by file extension
+CONTENT_TYPES = {
+    '.html': 'text/html',
+    '.js': 'application/javascript',
+    '.css': 'text/css',
+    '.json': 'application/json',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.svg': 'image/svg+xml',
+    '.ico': 'image/x-icon',
+    '.flac': 'audio/flac',
+    '.moc3': 'application/octet-stream',
+}
+
+def content_type_for(file_path: Path) -> str:
+    """Get content type based on file extension"""
+    return CONTENT_TYPES.get(file_path.suffix.lower(), 'application/octet-stream')
+
+def cache_control_for(file_path: Path, content_type: str) -> str:
+    """Cache-Control header value for a static file"""
+    if content_type == 'text/html':
+        # no-cache for HTML to ensure updates are seen (ETag makes revalidation cheap)
+        return 'no-cache, must-revalidate'
+    if file_path.parent.name == "assets" and HASHED_ASSET_RE.search(file_path.name):
+        # Vite build output (index-<hash>.js): content changes imply a new name
+        return 'public, max-age=31536000, immutable'
+    # Cache other static assets for 1 hour
+    return 'public, max-age=3600'
+
+def make_etag(content: bytes) -> str:
+    """Strong ETag derived from file content"""
+    return '"' + hashlib.sha256(content).hexdigest()[:16] + '"'
+
+# Frontend shell preloaded at server start: URL path ->
+# (content, content_type, etag, cache_control, header_block)
+PRELOAD_DIRS = ("assets", "js")
+_preloaded_files = {}
+
+def build_static_headers(content: bytes, content_type: str, etag: str, cache_control: str) -> bytes:
+    """Pre-format the complete 200 status line + header block for a static file"""
+    return (
+        f"{BaseHTTPRequestHandler.protocol_version} 200 OK\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(content)}\r\n"
+        "Access-Control-Allow-Origin: *\r\n"
+        f"ETag: {etag}\r\n"
+        f"Cache-Control: {cache_control}\r\n"
+        "\r\n"
+    ).encode('latin-1')
+
+# Complete response to a fire-and-forget "pulse" hook (PostToolUse heartbeat)
+_PULSE_BODY = _dumps({"choice": None, "user_input": None})
+_PULSE_RESPONSE = (
+    f"{BaseHTTPRequestHandler.protocol_version} 200 OK\r\n"
+    "Content-Type: application/json\r\n"
+    f"Content-Length: {len(_PULSE_BODY)}\r\n"
+    "Access-Control-Allow-Origin: *\r\n"
+    "\r\n"
+).encode('latin-1') + _PULSE_BODY
+
+def add_preloaded_file(file_path: Path, content: bytes):
+    """Register a file under its URL path with all response parts precomputed"""
+    content_type = content_type_for(file_path)
+    etag = make_etag(content)
+    cache_control = cache_control_for(file_path, content_type)
+    url_path = "/" + file_path.relative_to(FRONTEND_PUBLIC).as_posix()
+    _preloaded_files[url_path] = (content, content_type, etag, cache_control,
+                                  build_static_headers(content, content_type, etag, cache_control))
+
+def preload_frontend():
+    """Read index.html and the build assets into memory so they are served without disk I/O"""
+    files = [FRONTEND_PUBLIC / "index.html"]
+    for dirname in PRELOAD_DIRS:
+        try:
+            with os.scandir(FRONTEND_PUBLIC / dirname) as entries:
+                files.extend(Path(entry.path) for entry in entries if entry.is_file())
+        except OSError:
+            pass
+
+    for file_path in files:
+        try:
+            content = file_path.read_bytes()
+        except OSError:
+            continue
+        add_preloaded_file(file_path, content)
+    if "/index.html" in _preloaded_files:
+        _preloaded_files["/"] = _preloaded_files["/index.html"]
+
+# File cache for other static files (models), filled on demand
+# str(path) -> (response, (st_mtime_ns, st_size, st_ino), last_checked), where response is
+# (content, content_type, etag, cache_control) as in _preloaded_files
 _file_cache = {}
-_file_cache_timestamps = {}
+FILE_CACHE_TTL = 10.0  # Seconds a cached entry is trusted without re-stat'ing the file
+FROZEN = getattr(sys, 'frozen', False)  # Packaged build: bundled files never change
+# Files at least this big (e.g. large custom model textures) are not held in
+# memory; their entries have content=None and are streamed with sendfile
+LARGE_FILE_BYTES = 1 << 20
 
 def get_file_with_cache(file_path: Path):
-    """Get file content with caching"""
+    """Get (content, content_type, etag, cache_control) for a file, or None if it doesn't exist
+
+    content is None for files of LARGE_FILE_BYTES or more (see send_large_file).
+    Entries are re-validated with a single os.stat at most every
+    FILE_CACHE_TTL seconds (never in packaged builds).
+    """
     file_str = str(file_path)
-    mtime = file_path.stat().st_mtime if file_path.exists() else 0
+    cached = _file_cache.get(file_str)
+    now = time.monotonic()
+    if cached is not None and (FROZEN or now - cached[2] < FILE_CACHE_TTL):
+        return cached[0]
     
-    # Check if cache is valid
-    if file_str in _file_cache and _file_cache_timestamps.get(file_str) == mtime:
-        return _file_cache[file_str]
+    try:
+        st = os.stat(file_str)
+    except OSError:
+        _file_cache.pop(file_str, None)
+        return None
+    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
     
-    # Read and cache file
-    if file_path.exists():
-        with open(file_path, 'rb') as f:
+    # Unchanged on disk: just extend the TTL
+    if cached is not None and cached[1] == signature:
+        _file_cache[file_str] = (cached[0], signature, now)
+        return cached[0]
+    
+    content_type = content_type_for(file_path)
+    if st.st_size >= LARGE_FILE_BYTES:
+        # Weak ETag from the stat signature instead of hashing the whole file
+        etag = f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"'
+        response = (None, content_type, etag, cache_control_for(file_path, content_type))
+        _file_cache[file_str] = (response, signature, now)
+        return response
+    
+    # Read and cache file (content type and headers are computed once here)
+    try:
+        with open(file_str, 'rb') as f:
             content = f.read()
-        _file_cache[file_str] = content
-        _file_cache_timestamps[file_str] = mtime
-        return content
-    return None
+    except OSError:
+        return None
+    response = (content, content_type, make_etag(content), cache_control_for(file_path, content_type))
+    _file_cache[file_str] = (response, signature, now)
+    return response
+
+def warm_static_cache():
+    """Read the remaining static files (models) into memory at startup
+
+    Packaged builds never change their files, so models join the preloaded
+    URL table; in development (and for files of LARGE_FILE_BYTES or more)
+    they go through the TTL-validated file cache.
+    """
+    for dirpath, _, filenames in os.walk(FRONTEND_PUBLIC / "models"):
+        for filename in filenames:
+            file_path = Path(dirpath) / filename
+            if FROZEN:
+                try:
+                    if file_path.stat().st_size < LARGE_FILE_BYTES:
+                        add_preloaded_file(file_path, file_path.read_bytes())
+                        continue
+                except OSError:
+                    continue
+            get_file_with_cache(file_path)
+
 
 # Shared state
 class ServerState:
+    # Fields reported by /status; assigning any of them invalidates the cached body
+    STATUS_FIELDS = frozenset({
+        "spy_mode", "current_pid", "current_state", "current_hook_payload",
+        "pending_hook_payload", "pending_hook_type", "pending_hook_action",
+        "current_request_id",
+    })
+
     def __init__(self):
+        # Bumped on every status field write; a cached /status body is only
+        # served while the generation it was built at is still current
+        object.__setattr__(self, "_status_generations", itertools.count(1))
+        object.__setattr__(self, "status_generation", 0)
+        self.status_cache = None  # (generation, body, etag) of the last /status build
         self.spy_mode = True  # Default to slacking mode
         self.current_pid = 0
         self.current_state = "resting"  # resting, working, confirming
-        self.pending_response = None
-        self.pending_response_lock = threading.Lock()
-        self.callbacks = []  # UI update callbacks
+        # One Future per blocking hook waiting for the UI: request id -> Future;
+        # the lock only guards the dict, results are set outside it
+        self.pending_responses = {}
+        self.pending_responses_lock = threading.Lock()
+        self.current_request_id = None  # Blocking hook the UI is currently showing
+        self._request_ids = itertools.count(1)
+        # Guards current_state / pending_hook_* / queued_notification_need / spy_mode,
+        # which request threads read-modify-write concurrently
+        self.state_lock = threading.RLock()
+        # UI update callbacks; an immutable tuple replaced on registration, so
+        # dispatchers iterate it without a lock
+        self.callbacks = ()
         self.pending_hook_payload = None  # Store hook payload for confirming state
         self.pending_hook_type = None  # Store hook type (PermissionRequest/Notification)
         self.pending_hook_action = None  # Store hook action (ask_permission/ask_user)
@@ -101,107 +352,243 @@ class ServerState:
         # Window move callback (set by launch_window.py)
         self.window_move_callback = None
 
+    def __setattr__(self, name, value):
+        if name in ServerState.STATUS_FIELDS:
+            object.__setattr__(self, name, value)
+            object.__setattr__(self, "status_generation", next(self._status_generations))
+            return
+        object.__setattr__(self, name, value)
+
+    def open_pending_response(self):
+        """Register a blocking hook awaiting the UI; it becomes the current one
+
+        Returns:
+            (request_id, Future resolved with {"choice", "user_input"})
+        """
+        future = Future()
+        with self.pending_responses_lock:
+            request_id = str(next(self._request_ids))
+            self.pending_responses[request_id] = future
+        with self.state_lock:
+            self.current_request_id = request_id
+        return request_id, future
+
+    def resolve_pending_response(self, response, request_id=None):
+        """Complete a waiting blocking hook (the current one by default)
+
+        Returns:
+            True if a waiting hook received the response
+        """
+        request_id = request_id or self.current_request_id
+        with self.pending_responses_lock:
+            future = self.pending_responses.pop(request_id, None)
+        if future is None:
+            return False
+        with self.state_lock:
+            if self.current_request_id == request_id:
+                self.current_request_id = None
+        future.set_result(response)
+        return True
+
+    def discard_pending_response(self, request_id):
+        """Forget a blocking hook that stopped waiting (timed out)"""
+        with self.pending_responses_lock:
+            self.pending_responses.pop(request_id, None)
+        with self.state_lock:
+            if self.current_request_id == request_id:
+                self.current_request_id = None
+
+    def clear_pending_hook(self):
+        """Return to resting and forget the pending blocking hook"""
+        with self.state_lock:
+            self.current_state = "resting"
+            self.pending_hook_payload = None
+            self.pending_hook_type = None
+            self.pending_hook_action = None
+
 server_state = ServerState()
 
+class ClawCatHTTPServer(HTTPServer):
+    """Loopback HTTP server handling connections on a bounded pool of worker threads
+
+    Workers are daemon threads started on demand (up to max_workers) and then
+    reused, so bursts don't pay a thread start per connection and a blocked
+    hook wait never keeps the process alive at exit. When every worker is busy
+    and the hand-off queue is full, the accept loop blocks and further
+    connections wait in the listen backlog.
+    """
+    allow_reuse_address = True
+    request_queue_size = 128  # listen() backlog
+    max_workers = 32
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._requests = queue.Queue(maxsize=self.request_queue_size)
+        self._workers_lock = threading.Lock()
+        self._worker_count = 0
+        self._idle_workers = 0
+
+    def process_request(self, request, client_address):
+        """Hand the connection to a worker instead of starting a thread for it"""
+        # Each connection claims an idle worker or a new one, so a request can
+        # never queue behind a worker that is about to block on a hook
+        with self._workers_lock:
+            start_worker = False
+            if self._idle_workers:
+                self._idle_workers -= 1
+            elif self._worker_count < self.max_workers:
+                self._worker_count += 1
+                start_worker = True
+        if start_worker:
+            threading.Thread(target=self._worker, name=f"clawcat-http-{self._worker_count}", daemon=True).start()
+        self._requests.put((request, client_address))
+
+    def _worker(self):
+        """Serve queued connections until the process exits"""
+        while True:
+            request, client_address = self._requests.get()
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+            with self._workers_lock:
+                self._idle_workers += 1
+
 class ClawCatHandler(BaseHTTPRequestHandler):
+    # Buffer wfile so status line + headers + body leave in one send();
+    # handle_one_request() flushes it after each request
+    wbufsize = 64 * 1024
+    # Larger rfile buffer so a typical hook payload arrives in one read
+    rbufsize = 64 * 1024
+    # Upper bound on POST bodies; hook payloads embed tool input (e.g. files
+    # being written), so leave generous headroom
+    MAX_POST_BYTES = 8 << 20
+
+    def setup(self):
+        """Disable Nagle on the loopback connection so small responses aren't held back"""
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+    # Request path -> handler method name
+    POST_ROUTES = {
+        "/claude-hook": "handle_hook",
+        "/toggle-mode": "handle_toggle_mode",
+        "/activate-terminal": "handle_activate_terminal",
+        "/set-topmost": "handle_set_topmost",
+        "/hook-response": "handle_hook_response",
+        "/set-state": "handle_set_state",
+        "/execute-command": "handle_execute_command",
+        "/set-mode-command": "handle_set_mode_command",
+        "/move-window": "handle_move_window",
+    }
+    GET_ROUTES = {
+        "/status": "handle_status",
+    }
+    STATIC_PREFIXES = ("/assets/", "/js/", "/models/")
+
     def do_POST(self):
         """Handle POST requests"""
-        parsed_path = urlparse(self.path)
-
-        if parsed_path.path == "/claude-hook":
-            self.handle_hook()
-        elif parsed_path.path == "/toggle-mode":
-            self.handle_toggle_mode()
-        elif parsed_path.path == "/activate-terminal":
-            self.handle_activate_terminal()
-        elif parsed_path.path == "/set-topmost":
-            self.handle_set_topmost()
-        elif parsed_path.path == "/hook-response":
-            self.handle_hook_response()
-        elif parsed_path.path == "/set-state":
-            self.handle_set_state()
-        elif parsed_path.path == "/execute-command":
-            self.handle_execute_command()
-        elif parsed_path.path == "/set-mode-command":
-            self.handle_set_mode_command()
-        elif parsed_path.path == "/move-window":
-            self.handle_move_window()
+        # Clients never send fragments, so dropping the query is all urlparse would do
+        path = self.path.split('?', 1)[0]
+
+        handler = self.POST_ROUTES.get(path)
+        if handler:
+            if self.content_length() > self.MAX_POST_BYTES:
+                self.send_error(413, "Payload Too Large")
+                return
+            getattr(self, handler)()
         else:
             self.send_error(404, "Not Found")
 
     def do_GET(self):
         """Handle GET requests - all files served from public directory"""
-        parsed_path = urlparse(self.path)
+        path = self.path.split('?', 1)[0]
 
-        if parsed_path.path == "/status":
-            self.handle_status()
-        elif parsed_path.path == "/" or parsed_path.path == "/index.html":
+        handler = self.GET_ROUTES.get(path)
+        if handler:
+            getattr(self, handler)()
+            return
+        preloaded = _preloaded_files.get(path)
+        if preloaded:
+            # index.html and build assets (plus models when packaged), served from memory
+            self.send_static_content(*preloaded)
+        elif path == "/" or path == "/index.html":
             # Serve index.html from public
-            self.serve_static_file(FRONTEND_PUBLIC / "index.html", "text/html")
-        elif parsed_path.path.startswith("/assets/") or parsed_path.path.startswith("/js/") or parsed_path.path.startswith("/models/"):
+            self.serve_static_file(FRONTEND_PUBLIC / "index.html")
+        elif path.startswith(self.STATIC_PREFIXES):
             # Serve all static files from public directory
-            file_path = FRONTEND_PUBLIC / parsed_path.path[1:]  # Remove leading /
-            if file_path.exists():
-                content_type = self.get_content_type(file_path)
-                self.serve_static_file(file_path, content_type)
-            else:
-                self.send_error(404, "Not Found")
+            # (serve_static_file answers 404 for missing files)
+            self.serve_static_file(FRONTEND_PUBLIC / path[1:])  # Remove leading /
         else:
             self.send_error(404, "Not Found")
     
-    def get_content_type(self, file_path):
-        """Get content type based on file extension"""
-        ext = file_path.suffix.lower()
-        content_types = {
-            '.html': 'text/html',
-            '.js': 'application/javascript',
-            '.css': 'text/css',
-            '.json': 'application/json',
-            '.png': 'image/png',
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.gif': 'image/gif',
-            '.svg': 'image/svg+xml',
-            '.ico': 'image/x-icon',
-            '.flac': 'audio/flac',
-            '.moc3': 'application/octet-stream',
-            '.motion3.json': 'application/json',
-            '.exp3.json': 'application/json',
-            '.cdi3.json': 'application/json',
-            '.model3.json': 'application/json',
-        }
-        return content_types.get(ext, 'application/octet-stream')
-    
-    def serve_static_file(self, file_path, content_type):
+    def serve_static_file(self, file_path):
         """Serve a static file with caching"""
         try:
-            content = get_file_with_cache(file_path)
-            if content is None:
+            cached = get_file_with_cache(file_path)
+            if cached is None:
                 self.send_error(404, "Not Found")
                 return
-            
+            if cached[0] is None:
+                self.send_large_file(file_path, *cached[1:])
+            else:
+                self.send_static_content(*cached)
+        except Exception as e:
+            log.error("Error serving file %s: %s", file_path, e)
+            self.send_error(500, "Internal Server Error")
+    
+    def send_static_content(self, content, content_type, etag, cache_control, header_block=None):
+        """Send static file content, or 304 if the client already has this ETag
+
+        header_block is the pre-formatted 200 header block for preloaded files.
+        """
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', cache_control)
+            self.end_headers()
+            return
+        
+        if header_block is not None:
+            # Both writes land in the buffered wfile and go out together
+            self.wfile.write(header_block)
+            self.wfile.write(content)
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', cache_control)
+        self.end_headers()
+        self.wfile.write(content)
+    
+    def send_large_file(self, file_path, content_type, etag, cache_control):
+        """Stream a large static file from disk with sendfile (zero-copy where supported)"""
+        if self.headers.get('If-None-Match') == etag:
+            self.send_static_content(None, content_type, etag, cache_control)
+            return
+        
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
             self.send_response(200)
             self.send_header('Content-Type', content_type)
-            self.send_header('Content-Length', str(len(content)))
+            self.send_header('Content-Length', str(size))
             self.send_header('Access-Control-Allow-Origin', '*')
-            
-            # Enable browser caching for static assets (1 hour)
-            # But no-cache for HTML to ensure updates are seen
-            if content_type == 'text/html':
-                self.send_header('Cache-Control', 'no-cache, must-revalidate')
-            else:
-                # Cache static assets for 1 hour
-                self.send_header('Cache-Control', 'public, max-age=3600')
-            
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', cache_control)
             self.end_headers()
-            self.wfile.write(content)
-        except Exception as e:
-            print(f"Error serving file {file_path}: {e}", file=sys.stderr, flush=True)
-            self.send_error(500, "Internal Server Error")
+            # Headers sit in the wfile buffer; push them out before the body bypasses it
+            self.wfile.flush()
+            self.connection.sendfile(f, 0, size)
     
     def do_OPTIONS(self):
         """Handle OPTIONS requests (CORS preflight)"""
-        print(f"[CORS] OPTIONS request for {self.path}", file=sys.stderr, flush=True)
+        log.info("[CORS] OPTIONS request for %s", self.path)
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
@@ -212,84 +599,56 @@ class ClawCatHandler(BaseHTTPRequestHandler):
     def handle_hook(self):
         """Handle hook requests from notify.py"""
         try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            payload = json.loads(body.decode('utf-8'))
+            payload = self.read_json_body()
             
             action = payload.get("action", "")
             mode = payload.get("mode", "")
-            print(f"[Hook] Action: {action}, Mode: {mode}, PID: {payload.get('pid', 0)}", file=sys.stderr, flush=True)
+            if action == "pulse" and mode == "fire_and_forget":
+                # Pulses never change state; only track the terminal PID (as
+                # apply_hook_state would) and answer with the canned response
+                pid = payload.get("pid", 0)
+                if pid > 0 and pid != server_state.current_pid:
+                    with server_state.state_lock:
+                        if server_state.current_state != "confirming":
+                            server_state.current_pid = pid
+                self.wfile.write(_PULSE_RESPONSE)
+                if server_state.callbacks:
+                    self.notify_ui(payload)
+                return
+            log.info("[Hook] Action: %s, Mode: %s, PID: %s", action, mode, payload.get('pid', 0))
 
-            # If we're already in confirming state (waiting for UI response), 
-            # queue fire_and_forget requests (like notification_need) to show after timeout
-            if server_state.current_state == "confirming" and mode == "fire_and_forget":
-                if action == "notification_need":
+            with server_state.state_lock:
+                # If we're already in confirming state (waiting for UI response), 
+                # queue fire_and_forget requests (like notification_need) to show after timeout
+                already_confirming = server_state.current_state == "confirming" and mode == "fire_and_forget"
+                if already_confirming and action == "notification_need":
                     # Save notification_need to show after timeout
                     server_state.queued_notification_need = payload
-                    print(f"[State] Queued {action} (will show after confirming timeout)", file=sys.stderr, flush=True)
+                elif not already_confirming:
+                    self.apply_hook_state(payload, action)
+                spy_mode = server_state.spy_mode
+
+            if already_confirming:
+                if action == "notification_need":
+                    log.info("[State] Queued %s (will show after confirming timeout)", action)
                 else:
-                    print(f"[State] Ignoring {action} (already in confirming state, waiting for UI response)", file=sys.stderr, flush=True)
+                    log.info("[State] Ignoring %s (already in confirming state, waiting for UI response)", action)
                 response = {"choice": None, "user_input": None}
                 self.send_json_response(200, response)
                 return
-
-            # Update current PID directly from payload (terminal PID from notify.py)
-            if payload.get("pid", 0) > 0:
-                server_state.current_pid = payload.get("pid", 0)
-            
-            # Update state based on action and mode
-            old_state = server_state.current_state
-            
-            # Handle set_state action
-            if action == "set_state" and "data" in payload and "state" in payload["data"]:
-                new_state = payload["data"]["state"]
-                if new_state in ["resting", "working", "confirming"]:
-                    server_state.current_state = new_state
-                    # Store payload for all states (especially working for UI notification)
-                    server_state.current_hook_payload = payload
-                    print(f"[State] {old_state} -> {new_state} (Caption: {payload['data'].get('caption', 'N/A')})", file=sys.stderr, flush=True)
-            # Handle blocking mode
-            elif payload.get("mode") == "blocking":
-                server_state.current_state = "confirming"
-                # Store hook type and action for UI
-                server_state.pending_hook_payload = payload
-                server_state.pending_hook_type = payload.get("action", "")  # ask_permission or ask_user
-                server_state.pending_hook_action = payload.get("action", "")
-                server_state.current_hook_payload = payload
-                print(f"[State] {old_state} -> confirming (Blocking request)", file=sys.stderr, flush=True)
-            # Handle notification_need: fire_and_forget, show notification like session stop
-            elif action == "notification_need":
-                server_state.current_state = "resting"
-                server_state.current_hook_payload = payload
-                print(f"[State] {old_state} -> resting (Notification need)", file=sys.stderr, flush=True)
-            # Default to working for other actions
-            elif action not in ["ignore", "pulse"]:
-                server_state.current_state = "working"
-                server_state.current_hook_payload = payload
-                print(f"[State] {old_state} -> working (Action: {action})", file=sys.stderr, flush=True)
             
             # In slacking mode, return __IGNORE__ for blocking requests
-            if server_state.spy_mode:
+            if spy_mode:
                 if payload.get("mode") == "blocking":
-                    # Complete logging for blocking POST in slacking mode
-                    print(f"[Blocking POST - Slacking Mode]", file=sys.stderr, flush=True)
-                    print(f"  Path: {self.path}", file=sys.stderr, flush=True)
-                    print(f"  Action: {payload.get('action', 'N/A')}", file=sys.stderr, flush=True)
-                    print(f"  Mode: {payload.get('mode', 'N/A')}", file=sys.stderr, flush=True)
-                    print(f"  PID: {payload.get('pid', 0)}", file=sys.stderr, flush=True)
-                    print(f"  Hook Type: {payload.get('action', 'N/A')}", file=sys.stderr, flush=True)
-                    print(f"  Timeout: {payload.get('timeout', 'N/A')}", file=sys.stderr, flush=True)
-                    print(f"  Full Payload: {json.dumps(payload, indent=2, ensure_ascii=False)}", file=sys.stderr, flush=True)
+                    # Full payload logging for blocking POST (CLAWCAT_DEBUG=hooks)
+                    debug_hook("Blocking POST - Slacking Mode", payload)
                     response = {
                         "choice": "__IGNORE__",
                         "user_input": "__IGNORE__"
                     }
-                    print(f"  Response: {json.dumps(response, indent=2, ensure_ascii=False)}", file=sys.stderr, flush=True)
+                    debug_hook("Blocking POST - Slacking Mode - Response", response)
                     self.send_json_response(200, response)
-                    server_state.current_state = "resting"
-                    server_state.pending_hook_payload = None
-                    server_state.pending_hook_type = None
-                    server_state.pending_hook_action = None
+                    server_state.clear_pending_hook()
                     return
                 # Allow visual updates in slacking mode
                 self.notify_ui(payload)
@@ -299,26 +658,17 @@ class ClawCatHandler(BaseHTTPRequestHandler):
             
             # Spying mode - handle normally
             if payload.get("mode") == "blocking":
-                # Complete logging for blocking POST in spying mode
-                print(f"[Blocking POST - Spying Mode]", file=sys.stderr, flush=True)
-                print(f"  Path: {self.path}", file=sys.stderr, flush=True)
-                print(f"  Action: {payload.get('action', 'N/A')}", file=sys.stderr, flush=True)
-                print(f"  Mode: {payload.get('mode', 'N/A')}", file=sys.stderr, flush=True)
-                print(f"  PID: {payload.get('pid', 0)}", file=sys.stderr, flush=True)
-                print(f"  Hook Type: {payload.get('action', 'N/A')}", file=sys.stderr, flush=True)
-                print(f"  Timeout: {payload.get('timeout', 'N/A')}", file=sys.stderr, flush=True)
-                print(f"  Full Payload: {json.dumps(payload, indent=2, ensure_ascii=False)}", file=sys.stderr, flush=True)
+                # Full payload logging for blocking POST (CLAWCAT_DEBUG=hooks)
+                debug_hook("Blocking POST - Spying Mode", payload)
                 # For blocking requests, store payload and wait for UI response
                 self.notify_ui(payload)
                 response = self.wait_for_ui_response(payload)
-                print(f"  Response: {json.dumps(response, indent=2, ensure_ascii=False)}", file=sys.stderr, flush=True)
+                debug_hook("Blocking POST - Spying Mode - Response", response)
                 self.send_json_response(200, response)
-                server_state.current_state = "resting"
-                server_state.pending_hook_payload = None
-                server_state.pending_hook_type = None
-                server_state.pending_hook_action = None
-                # Clear queued notification_need if user responded (no need to show it)
-                server_state.queued_notification_need = None
+                with server_state.state_lock:
+                    server_state.clear_pending_hook()
+                    # Clear queued notification_need if user responded (no need to show it)
+                    server_state.queued_notification_need = None
             else:
                 # Fire and forget - just notify UI
                 self.notify_ui(payload)
@@ -326,16 +676,55 @@ class ClawCatHandler(BaseHTTPRequestHandler):
                 self.send_json_response(200, response)
                 
         except Exception as e:
-            print(f"Error handling hook: {e}", file=sys.stderr)
+            log.error("Error handling hook: %s", e)
             self.send_error(500, str(e))
     
+    def apply_hook_state(self, payload, action):
+        """Update server_state for an incoming hook (caller holds server_state.state_lock)"""
+        # Update current PID directly from payload (terminal PID from notify.py)
+        if payload.get("pid", 0) > 0:
+            server_state.current_pid = payload.get("pid", 0)
+        
+        # Update state based on action and mode
+        old_state = server_state.current_state
+        
+        # Handle set_state action
+        if action == "set_state" and "data" in payload and "state" in payload["data"]:
+            new_state = payload["data"]["state"]
+            if new_state in ["resting", "working", "confirming"]:
+                server_state.current_state = new_state
+                # Store payload for all states (especially working for UI notification)
+                server_state.current_hook_payload = payload
+                log.info("[State] %s -> %s (Caption: %s)", old_state, new_state, payload['data'].get('caption', 'N/A'))
+        # Handle blocking mode
+        elif payload.get("mode") == "blocking":
+            server_state.current_state = "confirming"
+            # Store hook type and action for UI
+            server_state.pending_hook_payload = payload
+            server_state.pending_hook_type = payload.get("action", "")  # ask_permission or ask_user
+            server_state.pending_hook_action = payload.get("action", "")
+            server_state.current_hook_payload = payload
+            log.info("[State] %s -> confirming (Blocking request)", old_state)
+        # Handle notification_need: fire_and_forget, show notification like session stop
+        elif action == "notification_need":
+            server_state.current_state = "resting"
+            server_state.current_hook_payload = payload
+            log.info("[State] %s -> resting (Notification need)", old_state)
+        # Default to working for other actions
+        elif action not in ["ignore", "pulse"]:
+            server_state.current_state = "working"
+            server_state.current_hook_payload = payload
+            log.info("[State] %s -> working (Action: %s)", old_state, action)
+    
     def handle_toggle_mode(self):
         """Handle mode toggle requests"""
-        old_mode = "slacking" if server_state.spy_mode else "spying"
-        server_state.spy_mode = not server_state.spy_mode
-        mode = "slacking" if server_state.spy_mode else "spying"
+        with server_state.state_lock:
+            server_state.spy_mode = not server_state.spy_mode
+            spy_mode = server_state.spy_mode
+        old_mode = "spying" if spy_mode else "slacking"
+        mode = "slacking" if spy_mode else "spying"
         
-        print(f"[Toggle Mode] {old_mode} -> {mode}, PID: {server_state.current_pid}", file=sys.stderr, flush=True)
+        log.info("[Toggle Mode] %s -> %s, PID: %s", old_mode, mode, server_state.current_pid)
 
         # Send response immediately
         response = {
@@ -354,24 +743,24 @@ class ClawCatHandler(BaseHTTPRequestHandler):
                 if server_state.current_pid > 0:
                     if server_state.spy_mode:
                         # Slacking mode: 激活 terminal（自动恢复+置顶）
-                        print(f"[Window] Activating window for PID {server_state.current_pid}", file=sys.stderr, flush=True)
-                        result = activate_window(server_state.current_pid)
-                        print(f"[Window] activate_window={result} (includes restore + topmost)", file=sys.stderr, flush=True)
+                        log.info("[Window] Activating window for PID %s", server_state.current_pid)
+                        result = debounced_window_op(activate_window, server_state.current_pid)
+                        log.info("[Window] activate_window=%s (includes restore + topmost)", result)
                         # 执行 slacking 模式的命令（如果有配置）
                         if server_state.spy_mode_command:
                             self.execute_terminal_command("slacking", server_state.spy_mode_command)
                     else:
                         # Spying mode: 关闭 terminal
-                        print(f"[Window] Minimizing window for PID {server_state.current_pid}", file=sys.stderr, flush=True)
-                        result = minimize_window(server_state.current_pid)
-                        print(f"[Window] minimize_window={result}", file=sys.stderr, flush=True)
+                        log.info("[Window] Minimizing window for PID %s", server_state.current_pid)
+                        result = debounced_window_op(minimize_window, server_state.current_pid)
+                        log.info("[Window] minimize_window=%s", result)
                         # 执行 spying 模式的命令（如果有配置）
                         if server_state.monitor_mode_command:
                             self.execute_terminal_command("spying", server_state.monitor_mode_command)
                 else:
-                    print(f"[Window] Skipping window control: no valid PID (current_pid={server_state.current_pid})", file=sys.stderr, flush=True)
+                    log.info("[Window] Skipping window control: no valid PID (current_pid=%s)", server_state.current_pid)
             except Exception as e:
-                print(f"[Window] Background task error: {e}", file=sys.stderr, flush=True)
+                log.error("[Window] Background task error: %s", e)
 
         # Run everything in background
         threading.Thread(target=background_tasks, daemon=True).start()
@@ -385,82 +774,71 @@ class ClawCatHandler(BaseHTTPRequestHandler):
     def handle_set_topmost(self):
         """Handle set window topmost request"""
         try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            payload = json.loads(body.decode('utf-8'))
+            payload = self.read_json_body()
             
             topmost = payload.get("topmost", True)
             
             if server_state.current_pid > 0:
-                success = set_window_topmost(server_state.current_pid, topmost)
+                success = debounced_window_op(set_window_topmost, server_state.current_pid, topmost)
                 response = {"success": success}
             else:
                 response = {"success": False, "error": "No PID available"}
             
             self.send_json_response(200, response)
         except Exception as e:
-            print(f"Error setting topmost: {e}", file=sys.stderr)
+            log.error("Error setting topmost: %s", e)
             self.send_error(500, str(e))
     
     def handle_hook_response(self):
         """Handle hook response from UI (for confirming state)"""
         try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            payload = json.loads(body.decode('utf-8'))
+            payload = self.read_json_body()
             
             choice = payload.get("choice", "deny")
             user_input = payload.get("user_input")
             
-            print(f"[Hook Response] Received from UI: choice={choice}, user_input={user_input}", file=sys.stderr, flush=True)
+            log.info("[Hook Response] Received from UI: choice=%s, user_input=%s", choice, user_input)
             
-            # Store response for waiting hook
-            with server_state.pending_response_lock:
-                server_state.pending_response = {
-                    "choice": choice,
-                    "user_input": user_input
-                }
+            # Hand the response to the waiting hook (the one on screen unless the UI names one)
+            delivered = server_state.resolve_pending_response(
+                {"choice": choice, "user_input": user_input},
+                payload.get("request_id")
+            )
             
-            print(f"[Hook Response] Stored response, notifying waiting thread", file=sys.stderr, flush=True)
+            log.info("[Hook Response] Delivered to waiting hook: %s", delivered)
             
             # Update state back to resting
-            server_state.current_state = "resting"
-            server_state.pending_hook_payload = None
-            server_state.pending_hook_type = None
-            server_state.pending_hook_action = None
+            server_state.clear_pending_hook()
             
             response = {"success": True}
             self.send_json_response(200, response)
-            print(f"[Hook Response] Response sent to UI", file=sys.stderr, flush=True)
+            log.info("[Hook Response] Response sent to UI")
         except Exception as e:
-            print(f"Error handling hook response: {e}", file=sys.stderr)
+            log.error("Error handling hook response: %s", e)
             self.send_error(500, str(e))
     
     def handle_set_state(self):
         """Handle set state request"""
         try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            payload = json.loads(body.decode('utf-8'))
+            payload = self.read_json_body()
             
             new_state = payload.get("state", "resting")
             if new_state in ["resting", "working", "confirming"]:
-                server_state.current_state = new_state
+                with server_state.state_lock:
+                    server_state.current_state = new_state
                 response = {"success": True, "state": new_state}
             else:
                 response = {"success": False, "error": "Invalid state"}
             
             self.send_json_response(200, response)
         except Exception as e:
-            print(f"Error setting state: {e}", file=sys.stderr)
+            log.error("Error setting state: %s", e)
             self.send_error(500, str(e))
     
     def handle_execute_command(self):
         """Handle execute command request"""
         try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            payload = json.loads(body.decode('utf-8'))
+            payload = self.read_json_body()
             
             mode = payload.get("mode", "")
             command = payload.get("command", "")
@@ -473,15 +851,13 @@ class ClawCatHandler(BaseHTTPRequestHandler):
             
             self.send_json_response(200, response)
         except Exception as e:
-            print(f"Error executing command: {e}", file=sys.stderr)
+            log.error("Error executing command: %s", e)
             self.send_error(500, str(e))
     
     def handle_set_mode_command(self):
         """Handle set mode command request (configure commands for each mode)"""
         try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            payload = json.loads(body.decode('utf-8'))
+            payload = self.read_json_body()
             
             spy_command = payload.get("spy_command")
             monitor_command = payload.get("monitor_command")
@@ -498,15 +874,13 @@ class ClawCatHandler(BaseHTTPRequestHandler):
             }
             self.send_json_response(200, response)
         except Exception as e:
-            print(f"Error setting mode command: {e}", file=sys.stderr)
+            log.error("Error setting mode command: %s", e)
             self.send_error(500, str(e))
 
     def handle_move_window(self):
         """Handle move window request from frontend drag"""
         try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            payload = json.loads(body.decode('utf-8'))
+            payload = self.read_json_body()
 
             x = payload.get("x", 0)
             y = payload.get("y", 0)
@@ -520,14 +894,14 @@ class ClawCatHandler(BaseHTTPRequestHandler):
 
             self.send_json_response(200, response)
         except Exception as e:
-            print(f"Error moving window: {e}", file=sys.stderr)
+            log.error("Error moving window: %s", e)
             self.send_error(500, str(e))
     
     def execute_terminal_command(self, mode, custom_command=None):
         """Execute terminal command based on mode"""
         try:
             if server_state.current_pid <= 0:
-                print(f"Cannot execute command: no valid PID (current_pid={server_state.current_pid})", file=sys.stderr)
+                log.warning("Cannot execute command: no valid PID (current_pid=%s)", server_state.current_pid)
                 return False
             
             # 根据模式执行不同的命令
@@ -550,7 +924,7 @@ class ClawCatHandler(BaseHTTPRequestHandler):
             else:
                 return False
         except Exception as e:
-            print(f"Error executing terminal command: {e}", file=sys.stderr)
+            log.error("Error executing terminal command: %s", e)
             return False
     
     def send_command_to_terminal(self, command):
@@ -564,23 +938,20 @@ class ClawCatHandler(BaseHTTPRequestHandler):
             
             # 尝试使用 Windows Terminal 的 wt.exe
             # wt.exe -w 0 表示在当前窗口，new-tab 创建新标签页
-            try:
-                # 检查是否是 Windows Terminal
-                import psutil
-                proc = psutil.Process(server_state.current_pid)
-                proc_name = proc.name().lower()
-                
+            # 检查是否是 Windows Terminal
+            proc_name = get_process_name(server_state.current_pid)
+            if proc_name is not None:
                 if 'windowsterminal' in proc_name or 'wt.exe' in proc_name:
                     # 使用 wt.exe 执行命令
                     subprocess.Popen([
-                        'wt.exe', 
+                        WT_EXE, 
                         '-w', '0',  # 当前窗口
                         'new-tab',  # 新标签页
                         '--', 
                         'powershell', 
                         '-Command', 
                         command
-                    ], shell=True, creationflags=subprocess.CREATE_NO_WINDOW)
+                    ], creationflags=subprocess.CREATE_NO_WINDOW)
                     return True
                 else:
                     # 其他 terminal，尝试使用 PowerShell 执行
@@ -593,40 +964,61 @@ class ClawCatHandler(BaseHTTPRequestHandler):
                     }}
                     '''
                     subprocess.Popen([
-                        'powershell', 
+                        POWERSHELL_EXE, 
                         '-Command', 
                         ps_script
-                    ], shell=True, creationflags=subprocess.CREATE_NO_WINDOW)
+                    ], creationflags=subprocess.CREATE_NO_WINDOW, startupinfo=HIDDEN_STARTUPINFO)
                     return True
-            except ImportError:
+            else:
                 # 如果没有 psutil，使用简单的方法
                 subprocess.Popen([
-                    'powershell', 
+                    POWERSHELL_EXE, 
                     '-Command', 
                     command
-                ], shell=True, creationflags=subprocess.CREATE_NO_WINDOW)
+                ], creationflags=subprocess.CREATE_NO_WINDOW, startupinfo=HIDDEN_STARTUPINFO)
                 return True
             
         except Exception as e:
-            print(f"Error sending command to terminal: {e}", file=sys.stderr)
+            log.error("Error sending command to terminal: %s", e)
             return False
 
     def handle_status(self):
         """Handle status request"""
-        response = {
-            "mode": "slacking" if server_state.spy_mode else "spying",
-            "pid": server_state.current_pid,
-            "state": server_state.current_state,
-            "message": self.get_status_message()
-        }
-        # Include hook payload for all states (for working notification and confirming)
-        if server_state.current_hook_payload:
-            response["hook_payload"] = server_state.current_hook_payload
-        # Only include hook type/action if in confirming state
-        if server_state.current_state == "confirming" and server_state.pending_hook_payload:
-            response["hook_type"] = server_state.pending_hook_type
-            response["hook_action"] = server_state.pending_hook_action
-        self.send_json_response(200, response)
+        # The body is re-serialized only after a status field changed
+        # (ServerState.__setattr__ bumps status_generation); respond outside the lock.
+        # The cache entry carries its generation, so a body built while a field
+        # was being written is never served once that write has landed
+        cached = server_state.status_cache
+        if cached is not None and cached[0] == server_state.status_generation:
+            _, body, etag = cached
+        else:
+            with server_state.state_lock:
+                generation = server_state.status_generation
+                response = {
+                    "mode": "slacking" if server_state.spy_mode else "spying",
+                    "pid": server_state.current_pid,
+                    "state": server_state.current_state,
+                    "message": self.get_status_message()
+                }
+                # Include hook payload for all states (for working notification and confirming)
+                if server_state.current_hook_payload:
+                    response["hook_payload"] = server_state.current_hook_payload
+                # Only include hook type/action if in confirming state
+                if server_state.current_state == "confirming" and server_state.pending_hook_payload:
+                    response["hook_type"] = server_state.pending_hook_type
+                    response["hook_action"] = server_state.pending_hook_action
+                    response["request_id"] = server_state.current_request_id
+                body = _dumps(response)
+                etag = make_etag(body)
+                server_state.status_cache = (generation, body, etag)
+        # Polls between state changes carry the same ETag: answer them without a body
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            return
+        self.send_json_bytes(200, body, etag)
     
     def get_status_message(self):
         """Get status message based on current state"""
@@ -641,42 +1033,48 @@ class ClawCatHandler(BaseHTTPRequestHandler):
         """Wait for UI to provide response (with timeout)"""
         timeout = payload.get("timeout", 90)
         
-        print(f"[Wait] Starting to wait for UI response (timeout={timeout}s)", file=sys.stderr, flush=True)
+        log.info("[Wait] Starting to wait for UI response (timeout=%ss)", timeout)
+        
+        # Register before notifying UI so a fast response isn't lost
+        request_id, future = server_state.open_pending_response()
         
         # Notify UI
         self.notify_ui(payload)
         
-        # Wait for response
-        with server_state.pending_response_lock:
-            server_state.pending_response = None
+        # Wait for response (resolved by handle_hook_response / send_hook_response)
+        start_time = time.monotonic()
+        deadline = start_time + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                response = future.result(min(remaining, 5.0))
+            except FutureTimeout:
+                if time.monotonic() < deadline:
+                    # Log every 5 seconds
+                    elapsed = time.monotonic() - start_time
+                    log.info("[Wait] Still waiting... (%.1fs elapsed)", elapsed)
+                continue
+            elapsed = time.monotonic() - start_time
+            log.info("[Wait] ✅ Received response after %.1fs: %s", elapsed, response)
+            return response
         
-        start_time = time.time()
-        poll_count = 0
-        while time.time() - start_time < timeout:
-            with server_state.pending_response_lock:
-                if server_state.pending_response is not None:
-                    response = server_state.pending_response
-                    server_state.pending_response = None
-                    elapsed = time.time() - start_time
-                    print(f"[Wait] ✅ Received response after {elapsed:.1f}s: {response}", file=sys.stderr, flush=True)
-                    return response
-            poll_count += 1
-            if poll_count % 50 == 0:  # Log every 5 seconds
-                elapsed = time.time() - start_time
-                print(f"[Wait] Still waiting... ({elapsed:.1f}s elapsed)", file=sys.stderr, flush=True)
-            time.sleep(0.1)
+        server_state.discard_pending_response(request_id)
         
         # Timeout
-        print(f"[Wait] ⏰ Timeout after {timeout}s, returning deny", file=sys.stderr, flush=True)
+        log.info("[Wait] ⏰ Timeout after %ss, returning deny", timeout)
         
         # Check if there's a queued notification_need to show after timeout
-        if server_state.queued_notification_need:
+        with server_state.state_lock:
             queued_payload = server_state.queued_notification_need
             server_state.queued_notification_need = None
-            print(f"[State] Showing queued notification_need after timeout", file=sys.stderr, flush=True)
-            # Change state to resting and notify UI
-            server_state.current_state = "resting"
-            server_state.current_hook_payload = queued_payload
+            if queued_payload:
+                # Change state to resting
+                server_state.current_state = "resting"
+                server_state.current_hook_payload = queued_payload
+        if queued_payload:
+            log.info("[State] Showing queued notification_need after timeout")
             self.notify_ui(queued_payload)
         
         return {"choice": "deny", "user_input": None}
@@ -684,29 +1082,57 @@ class ClawCatHandler(BaseHTTPRequestHandler):
     def notify_ui(self, payload):
         """Notify UI about hook update"""
         action = payload.get("action", "N/A")
-        print(f"[UI Notify] Action: {action}, Callbacks: {len(server_state.callbacks)}", file=sys.stderr, flush=True)
-        for callback in server_state.callbacks:
-            try:
-                callback(payload)
-            except Exception as e:
-                print(f"Error in UI callback: {e}", file=sys.stderr)
+        log.debug("[UI Notify] Action: %s, Callbacks: %s", action, len(server_state.callbacks))
+        if server_state.callbacks:
+            # Callbacks run on the dispatcher thread so they never delay the hook response
+            _ui_queue.put(payload)
+    
+    def content_length(self):
+        """Declared request body size (0 if missing or malformed)"""
+        try:
+            return max(int(self.headers['Content-Length'] or 0), 0)
+        except ValueError:
+            return 0
+    
+    def read_json_body(self):
+        """Read and parse the JSON request body (parse errors propagate to the handler)"""
+        return _loads(self.rfile.read(min(self.content_length(), self.MAX_POST_BYTES)))
     
     def send_json_response(self, status, data):
         """Send JSON response"""
-        self.send_response(status)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(data).encode('utf-8'))
+        self.send_json_bytes(status, _dumps(data))
+    
+    def send_json_bytes(self, status, body, etag=None):
+        """Send an already-serialized JSON body (revalidatable when etag is given)
+
+        Status line, headers and body are formatted into one bytes object and
+        written at once instead of going through send_header per line.
+        """
+        self.log_request(status)
+        reason = self.responses.get(status, ('',))[0]
+        head = (
+            f"{self.protocol_version} {status} {reason}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+        )
+        if etag is not None:
+            head += f"ETag: {etag}\r\nCache-Control: no-cache\r\n"
+        self.wfile.write(head.encode('latin-1') + b"\r\n" + body)
+    
+    def log_request(self, code='-', size='-'):
+        """Override to reduce logging noise: only failed non-GET requests are logged"""
+        # code is an int / HTTPStatus, or '-' when unknown
+        if self.command == 'GET' or not isinstance(code, int) or code < 400:
+            return
+        self.log_message('"%s" %s %s', self.requestline, int(code), size)
     
     def log_message(self, format, *args):
-        """Override to reduce logging noise"""
+        """Route http.server messages through the logger instead of unbuffered stderr"""
         # Skip GET requests completely
         if self.command == 'GET':
             return
-        # Only log errors for other requests
-        if args[1] != 200:
-            super().log_message(format, *args)
+        log.warning("%s - %s", self.address_string(), format % args)
 
 def get_server_state():
     """Get current server state (for UI)"""
@@ -718,28 +1144,49 @@ def get_server_state():
 def activate_terminal():
     """Activate terminal window (called by UI double-click)"""
     if server_state.current_pid > 0:
-        return activate_window(server_state.current_pid)
+        return debounced_window_op(activate_window, server_state.current_pid)
     else:
-        print(f"Cannot activate terminal: no valid PID (current_pid={server_state.current_pid})", file=sys.stderr)
+        log.warning("Cannot activate terminal: no valid PID (current_pid=%s)", server_state.current_pid)
         return False
 
-def send_hook_response(choice=None, user_input=None):
+def send_hook_response(choice=None, user_input=None, request_id=None):
     """Send response from UI (called by UI components)"""
-    with server_state.pending_response_lock:
-        server_state.pending_response = {
-            "choice": choice,
-            "user_input": user_input
-        }
+    return server_state.resolve_pending_response(
+        {"choice": choice, "user_input": user_input},
+        request_id
+    )
+
+# Hook payloads waiting to be handed to the registered UI callbacks
+_ui_queue = queue.SimpleQueue()
+_ui_dispatcher = None
+_ui_callbacks_lock = threading.Lock()  # Serializes register_ui_callback only
+
+def dispatch_ui_callbacks():
+    """Deliver queued hook payloads to the UI callbacks, in arrival order"""
+    while True:
+        payload = _ui_queue.get()
+        for callback in server_state.callbacks:
+            try:
+                callback(payload)
+            except Exception as e:
+                log.error("Error in UI callback: %s", e)
 
 def register_ui_callback(callback):
-    """Register a callback for UI updates"""
-    server_state.callbacks.append(callback)
+    """Register a callback for UI updates (starts the dispatcher thread on first use)"""
+    global _ui_dispatcher
+    with _ui_callbacks_lock:
+        server_state.callbacks = server_state.callbacks + (callback,)
+        if _ui_dispatcher is None:
+            _ui_dispatcher = threading.Thread(target=dispatch_ui_callbacks, name="clawcat-ui-callbacks", daemon=True)
+            _ui_dispatcher.start()
 
 def start_server(port=SERVER_PORT):
     """Start the HTTP server (multi-threaded to handle concurrent requests)"""
-    server = ThreadingHTTPServer(('127.0.0.1', port), ClawCatHandler)
-    print(f"ClawCat server listening on port {port}")
-    print(f"Multi-threaded server ready - debug logging enabled", flush=True)
+    preload_frontend()
+    warm_static_cache()
+    server = ClawCatHTTPServer(('127.0.0.1', port), ClawCatHandler)
+    log.info("ClawCat server listening on port %s", port)
+    log.info("Multi-threaded server ready - debug logging enabled")
     
     def run_server():
         server.serve_forever()
@@ -750,10 +1197,10 @@ def start_server(port=SERVER_PORT):
 
 if __name__ == "__main__":
     server, thread = start_server()
-    print("ClawCat server started. Press Ctrl+C to stop.")
+    log.info("ClawCat server started. Press Ctrl+C to stop.")
     try:
         thread.join()
     except KeyboardInterrupt:
-        print("\nShutting down server...")
+        log.info("Shutting down server...")
         server.shutdown()
 
@@ -3,10 +3,23 @@
 Windows Terminal Control Module
 Control terminal windows by PID using Win32 API
 """
+import os
 import sys
+import logging
 import ctypes
+import threading
+import time
 from ctypes import wintypes
 
+try:
+    import psutil as _psutil
+except ImportError:
+    _psutil = None
+
+# Logs go through the "clawcat" logger configured by launch_window
+# (or by __main__ below when run on its own)
+log = logging.getLogger("clawcat.window")
+
 # ============================================================================
 # Win32 API Constants
 # ============================================================================
@@ -29,107 +42,298 @@ HWND_TOPMOST = -1
 HWND_NOTOPMOST = -2
 SWP_NOMOVE = 0x0002
 SWP_NOSIZE = 0x0001
+SWP_NOACTIVATE = 0x0010
+SWP_SHOWWINDOW = 0x0040
+
+# Window styles (GetWindowLongPtr GWL_STYLE / GWL_EXSTYLE)
+GWL_STYLE = -16
+GWL_EXSTYLE = -20
+WS_VISIBLE = 0x10000000
+WS_CAPTION = 0x00C00000
+WS_EX_TOOLWINDOW = 0x00000080
+
+# Diagnostics: CLAWCAT_DEBUG=1 turns on every topic, or pick topics with a
+# comma-separated list (window, hooks). "window" logs titles while searching.
+_DEBUG_TOPICS = {t.strip() for t in os.environ.get("CLAWCAT_DEBUG", "").lower().split(",")}
+DEBUG = bool(_DEBUG_TOPICS & {"1", "window"})
+
+# GetWindowPlacement showCmd values meaning "minimized"
+MINIMIZED_SHOW_CMDS = frozenset({SW_SHOWMINIMIZED, SW_MINIMIZE, SW_SHOWMINNOACTIVE, SW_FORCEMINIMIZE})
+
+class WINDOWPLACEMENT(ctypes.Structure):
+    _fields_ = [
+        ("length", wintypes.UINT),
+        ("flags", wintypes.UINT),
+        ("showCmd", wintypes.UINT),
+        ("ptMinPosition", wintypes.POINT),
+        ("ptMaxPosition", wintypes.POINT),
+        ("rcNormalPosition", wintypes.RECT),
+    ]
 
 # Win32 API bindings
 user32 = ctypes.windll.user32
 kernel32 = ctypes.windll.kernel32
 
+# EnumWindows callback type; the callback object itself is created once below
+EnumWindowsProc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+
+# Prototypes, declared once: ctypes converts arguments directly and HWNDs
+# stay pointer-sized on 64-bit instead of going through the default c_int
+_PROTOTYPES = {
+    user32: {
+        "EnumWindows": ([EnumWindowsProc, wintypes.LPARAM], wintypes.BOOL),
+        "GetWindowThreadProcessId": ([wintypes.HWND, ctypes.POINTER(wintypes.DWORD)], wintypes.DWORD),
+        "GetWindowTextW": ([wintypes.HWND, wintypes.LPWSTR, ctypes.c_int], ctypes.c_int),
+        # 32-bit user32 only exports GetWindowLongW (GetWindowLongPtrW is a macro there)
+        "GetWindowLongPtrW" if hasattr(user32, "GetWindowLongPtrW") else "GetWindowLongW":
+            ([wintypes.HWND, ctypes.c_int], ctypes.c_ssize_t),
+        "IsWindow": ([wintypes.HWND], wintypes.BOOL),
+        "IsIconic": ([wintypes.HWND], wintypes.BOOL),
+        "IsZoomed": ([wintypes.HWND], wintypes.BOOL),
+        "GetWindowPlacement": ([wintypes.HWND, ctypes.POINTER(WINDOWPLACEMENT)], wintypes.BOOL),
+        "ShowWindow": ([wintypes.HWND, ctypes.c_int], wintypes.BOOL),
+        "SetForegroundWindow": ([wintypes.HWND], wintypes.BOOL),
+        "BringWindowToTop": ([wintypes.HWND], wintypes.BOOL),
+        "GetForegroundWindow": ([], wintypes.HWND),
+        "AttachThreadInput": ([wintypes.DWORD, wintypes.DWORD, wintypes.BOOL], wintypes.BOOL),
+        "SetWindowPos": ([wintypes.HWND, wintypes.HWND, ctypes.c_int, ctypes.c_int,
+                          ctypes.c_int, ctypes.c_int, wintypes.UINT], wintypes.BOOL),
+        "IsHungAppWindow": ([wintypes.HWND], wintypes.BOOL),
+    },
+    kernel32: {
+        "GetCurrentThreadId": ([], wintypes.DWORD),
+    },
+}
+for _dll, _functions in _PROTOTYPES.items():
+    for _name, (_argtypes, _restype) in _functions.items():
+        _function = getattr(_dll, _name)
+        _function.argtypes = _argtypes
+        _function.restype = _restype
+del _dll, _functions, _name, _argtypes, _restype, _function
+GetWindowLongPtrW = getattr(user32, "GetWindowLongPtrW", None) or user32.GetWindowLongW
+
 # ============================================================================
 # Window Discovery
 # ============================================================================
 
+# One EnumWindows sweep maps every visible app window to its owner PID;
+# the map is reused for SNAPSHOT_TTL seconds so a PID and all of its
+# ancestors (and concurrent searches) are resolved from a single sweep
+SNAPSHOT_TTL = 0.5
+_enum_lock = threading.Lock()
+_snapshot = {}
+_snapshot_expiry = 0.0
+
+# Scratch space for the shared callback, valid because enumeration is
+# serialized by _enum_lock: the map being filled and the owner-PID
+# out-parameter and title probe buffer (allocated once instead of per
+# enumerated window; one character is enough to tell a title is non-empty)
+_enum_windows = {}
+_enum_owner_pid = wintypes.DWORD()
+_enum_owner_pid_ref = ctypes.byref(_enum_owner_pid)
+_enum_title = ctypes.create_unicode_buffer(2)
+
+def _enum_windows_callback(hwnd, lParam):
+    """Record visible top-level app windows, first one per PID"""
+    # Cheapest checks first, from the style bits alone: most top-level windows
+    # are invisible (one GetWindowLongPtrW read, no separate IsWindowVisible
+    # call), and tool windows (palettes, tray helpers) never count
+    style = GetWindowLongPtrW(hwnd, GWL_STYLE)
+    if not (style & WS_VISIBLE):
+        return True
+    if GetWindowLongPtrW(hwnd, GWL_EXSTYLE) & WS_EX_TOOLWINDOW:
+        return True
+    # Captioned windows qualify on style alone; only borderless ones (e.g. a
+    # fullscreen terminal) pay for the title read, and need a non-empty title
+    if ((style & WS_CAPTION) != WS_CAPTION
+            and not user32.GetWindowTextW(hwnd, _enum_title, len(_enum_title))):
+        return True
+    
+    user32.GetWindowThreadProcessId(hwnd, _enum_owner_pid_ref)
+    _enum_windows.setdefault(_enum_owner_pid.value, hwnd)
+    return True
+
+_enum_windows_proc = EnumWindowsProc(_enum_windows_callback)
+
+def _snapshot_visible_windows():
+    """
+    pid -> hwnd for visible top-level app windows
+    (caller holds _enum_lock; re-enumerates once SNAPSHOT_TTL has passed)
+    """
+    global _snapshot, _snapshot_expiry
+    now = time.monotonic()
+    if now < _snapshot_expiry:
+        return _snapshot
+    
+    _enum_windows.clear()
+    user32.EnumWindows(_enum_windows_proc, 0)
+    _snapshot = dict(_enum_windows)
+    _snapshot_expiry = time.monotonic() + SNAPSHOT_TTL
+    return _snapshot
+
+def _log_match(pid, hwnd):
+    """Log the title of a matched window (CLAWCAT_DEBUG=window)"""
+    if DEBUG:
+        window_text = ctypes.create_unicode_buffer(256)
+        user32.GetWindowTextW(hwnd, window_text, 256)
+        log.info("[FindWindow] Found window for PID %s: hwnd=%s, title='%s'", pid, hwnd, window_text.value)
+
+# Ancestors of a PID, resolved once per PID: pid -> [(parent_pid, name), ...]
+# (nearest first). Dropped when nothing in the chain yields a window.
+MAX_PARENT_DEPTH = 10
+_parent_chain_cache = {}
+_parent_chain_lock = threading.Lock()
+
+def parent_chain(pid):
+    """Ancestors of pid as (pid, name) pairs, nearest first ([] without psutil)"""
+    with _parent_chain_lock:
+        chain = _parent_chain_cache.get(pid)
+    if chain is not None:
+        return chain
+    
+    chain = []
+    if _psutil is None:
+        log.warning("[FindWindow] psutil not available")
+        return chain
+    
+    current_pid = pid
+    for depth in range(MAX_PARENT_DEPTH):
+        try:
+            parent = _psutil.Process(current_pid).parent()
+            if not parent or parent.pid == current_pid:
+                log.info("[FindWindow] Reached end of parent chain")
+                break
+            chain.append((parent.pid, parent.name()))
+            current_pid = parent.pid
+        except (_psutil.NoSuchProcess, _psutil.AccessDenied) as e:
+            log.warning("[FindWindow] Error accessing parent: %s", e)
+            break
+    
+    with _parent_chain_lock:
+        _parent_chain_cache[pid] = chain
+    return chain
+
+def forget_parent_chain(pid):
+    """Drop the cached ancestors of pid so the next lookup walks the tree again"""
+    with _parent_chain_lock:
+        _parent_chain_cache.pop(pid, None)
+
+# Resolved windows: pid -> (hwnd, expiry on the monotonic clock)
+HWND_CACHE_TTL = 5.0
+_hwnd_cache = {}
+_hwnd_cache_lock = threading.Lock()
+
+def cache_window(pids, hwnd):
+    """Remember hwnd for each of pids for HWND_CACHE_TTL seconds"""
+    expiry = time.monotonic() + HWND_CACHE_TTL
+    with _hwnd_cache_lock:
+        for pid in pids:
+            _hwnd_cache[pid] = (hwnd, expiry)
+
+def forget_window(pid):
+    """Drop the cached window (and ancestors) for pid, e.g. after it turned out to be destroyed"""
+    with _hwnd_cache_lock:
+        _hwnd_cache.pop(pid, None)
+    forget_parent_chain(pid)
+
+def cached_window(pid):
+    """Cached hwnd for pid if it is fresh and still a window, else None"""
+    with _hwnd_cache_lock:
+        cached = _hwnd_cache.get(pid)
+    if cached and cached[1] > time.monotonic():
+        if user32.IsWindow(cached[0]):
+            return cached[0]
+    if cached:
+        forget_window(pid)
+    return None
+
 def find_window_by_pid(pid):
     """
     Find window handle by process ID
     
-    If no window is found for the given PID, recursively searches parent
-    processes (up to 10 levels) to find the terminal window.
+    If no window is found for the given PID, searches parent processes
+    (up to 10 levels) to find the terminal window. All levels are looked up
+    in one window snapshot. Results are cached for HWND_CACHE_TTL seconds.
     
     Returns:
         HWND or None
     """
-    def enum_windows_callback(hwnd, lParam):
-        """Callback to enumerate windows and match by PID"""
-        process_id = ctypes.c_ulong()
-        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(process_id))
-        
-        if process_id.value == lParam:
-            # Only consider visible windows with titles
-            if user32.IsWindowVisible(hwnd):
-                window_text = ctypes.create_unicode_buffer(256)
-                user32.GetWindowTextW(hwnd, window_text, 256)
-                if window_text.value:
-                    print(f"[FindWindow] Found window for PID {lParam}: hwnd={hwnd}, title='{window_text.value}'", 
-                          file=sys.stderr, flush=True)
-                    windows.append(hwnd)
-        return True
+    hwnd = cached_window(pid)
+    if hwnd:
+        return hwnd
     
-    # Try to find window for this PID
-    windows = []
-    callback_type = ctypes.WINFUNCTYPE(ctypes.c_bool, wintypes.HWND, wintypes.LPARAM)
-    user32.EnumWindows(callback_type(enum_windows_callback), pid)
+    with _enum_lock:
+        windows = _snapshot_visible_windows()
     
-    if windows:
-        return windows[0]
+    # Try to find window for this PID
+    hwnd = windows.get(pid)
+    if hwnd:
+        _log_match(pid, hwnd)
+        cache_window((pid,), hwnd)
+        return hwnd
     
     # No window found, search parent processes
-    print(f"[FindWindow] No window for PID {pid}, searching parent chain...", 
-          file=sys.stderr, flush=True)
+    log.info("[FindWindow] No window for PID %s, searching parent chain...", pid)
     
     try:
-        import psutil
-        current_pid = pid
-        max_depth = 10
-        
-        for depth in range(max_depth):
-            try:
-                proc = psutil.Process(current_pid)
-                parent = proc.parent()
-                
-                if not parent or parent.pid == current_pid:
-                    print(f"[FindWindow] Reached end of parent chain", file=sys.stderr, flush=True)
-                    break
-                
-                parent_pid = parent.pid
-                print(f"[FindWindow] Trying parent PID {parent_pid} ({parent.name()})", 
-                      file=sys.stderr, flush=True)
-                
-                # Search for window with parent PID
-                windows = []
-                user32.EnumWindows(callback_type(enum_windows_callback), parent_pid)
-                
-                if windows:
-                    return windows[0]
-                
-                current_pid = parent_pid
-                
-            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                print(f"[FindWindow] Error accessing parent: {e}", file=sys.stderr, flush=True)
-                break
-                
-    except ImportError:
-        print(f"[FindWindow] psutil not available", file=sys.stderr, flush=True)
+        for parent_pid, parent_name in parent_chain(pid):
+            hwnd = windows.get(parent_pid)
+            if hwnd:
+                log.info("[FindWindow] Using parent PID %s (%s)", parent_pid, parent_name)
+                _log_match(parent_pid, hwnd)
+                cache_window((pid, parent_pid), hwnd)
+                return hwnd
     except Exception as e:
-        print(f"[FindWindow] Error: {e}", file=sys.stderr, flush=True)
+        log.warning("[FindWindow] Error: %s", e)
     
-    print(f"[FindWindow] No window found for PID {pid}", file=sys.stderr, flush=True)
+    forget_parent_chain(pid)
+    log.warning("[FindWindow] No window found for PID %s", pid)
     return None
 
 # ============================================================================
 # Window Control Functions
 # ============================================================================
 
+def is_window_responsive(hwnd):
+    """
+    False if the window is gone or Windows considers it hung
+    
+    IsHungAppWindow uses the OS hung-window threshold (no input processed
+    for several seconds) and never blocks, so a terminal that is briefly
+    busy, e.g. mid-render, still counts as responsive.
+    """
+    return bool(user32.IsWindow(hwnd)) and not user32.IsHungAppWindow(hwnd)
+
+
+def force_foreground(hwnd):
+    """
+    Bring hwnd to the foreground even when another process owns it
+    
+    SetForegroundWindow is refused unless the caller shares input with the
+    current foreground thread, so attach to that thread for the call.
+    """
+    fg_tid = user32.GetWindowThreadProcessId(user32.GetForegroundWindow(), None)
+    cur_tid = kernel32.GetCurrentThreadId()
+    attached = bool(fg_tid and fg_tid != cur_tid and user32.AttachThreadInput(cur_tid, fg_tid, True))
+    try:
+        user32.BringWindowToTop(hwnd)
+        return bool(user32.SetForegroundWindow(hwnd))
+    finally:
+        if attached:
+            user32.AttachThreadInput(cur_tid, fg_tid, False)
+
+
 def minimize_window(pid):
     """Minimize window to taskbar"""
-    print(f"[MinimizeWindow] PID {pid}", file=sys.stderr, flush=True)
+    log.info("[MinimizeWindow] PID %s", pid)
     hwnd = find_window_by_pid(pid)
     
     if hwnd:
         result = user32.ShowWindow(hwnd, SW_MINIMIZE)
-        print(f"[MinimizeWindow] Result: {result}", file=sys.stderr, flush=True)
+        log.info("[MinimizeWindow] Result: %s", result)
         return True
     
-    print(f"[MinimizeWindow] Failed: No window found", file=sys.stderr, flush=True)
+    log.warning("[MinimizeWindow] Failed: No window found")
     return False
 
 
@@ -146,20 +350,68 @@ def maximize_window(pid):
 
 def restore_window(pid):
     """Restore window from minimized/maximized state"""
-    print(f"[RestoreWindow] PID {pid}", file=sys.stderr, flush=True)
+    log.info("[RestoreWindow] PID %s", pid)
     hwnd = find_window_by_pid(pid)
     
     if hwnd:
         result1 = user32.ShowWindow(hwnd, SW_RESTORE)
         result2 = user32.SetForegroundWindow(hwnd)
-        print(f"[RestoreWindow] ShowWindow: {result1}, SetForeground: {result2}", 
-              file=sys.stderr, flush=True)
+        log.info("[RestoreWindow] ShowWindow: %s, SetForeground: %s", result1, result2)
+        if not result2 and not user32.IsWindow(hwnd):
+            forget_window(pid)
         return True
     
-    print(f"[RestoreWindow] Failed: No window found", file=sys.stderr, flush=True)
+    log.warning("[RestoreWindow] Failed: No window found")
     return False
 
 
+def activate_and_topmost(pid, topmost=True):
+    """
+    Resolve the window once, then restore, foreground and pin/unpin it
+    
+    One call sequence on a single HWND: ShowWindow (only if minimized),
+    the foreground hand-off, and one SetWindowPos for the z-order.
+    
+    Args:
+        pid: Process ID
+        topmost: True to set always-on-top, False to remove it
+    
+    Returns:
+        (found: bool, SetWindowPos result)
+    """
+    hwnd = find_window_by_pid(pid)
+    if not hwnd:
+        log.warning("[ActivateWindow] Failed: No window found")
+        return False, 0
+    
+    # Don't block the request thread on a hung terminal
+    if not is_window_responsive(hwnd):
+        if not user32.IsWindow(hwnd):
+            forget_window(pid)
+        log.warning("[ActivateWindow] Failed: window not responding")
+        return False, 0
+    
+    # Restore from minimized
+    restored = bool(user32.IsIconic(hwnd)) and bool(user32.ShowWindow(hwnd, SW_RESTORE))
+    
+    # Bring to foreground
+    foreground = force_foreground(hwnd)
+    
+    # Set always-on-top status (shown, without re-activating)
+    result = user32.SetWindowPos(
+        hwnd,
+        HWND_TOPMOST if topmost else HWND_NOTOPMOST,
+        0, 0, 0, 0,
+        SWP_NOMOVE | SWP_NOSIZE | SWP_SHOWWINDOW | SWP_NOACTIVATE
+    )
+    if not result and not user32.IsWindow(hwnd):
+        forget_window(pid)
+    
+    log.info("[ActivateWindow] Results - Restore: %s, Foreground: %s, Topmost(%s): %s",
+             restored, foreground, topmost, result)
+    return True, result
+
+
 def activate_window(pid):
     """
     Activate window and bring to front
@@ -169,31 +421,9 @@ def activate_window(pid):
     2. Brings it to the foreground
     3. Sets it to always-on-top
     """
-    print(f"[ActivateWindow] PID {pid}", file=sys.stderr, flush=True)
-    hwnd = find_window_by_pid(pid)
-    
-    if hwnd:
-        # Restore from minimized/maximized
-        result1 = user32.ShowWindow(hwnd, SW_RESTORE)
-        
-        # Bring to foreground
-        result2 = user32.SetForegroundWindow(hwnd)
-        result3 = user32.BringWindowToTop(hwnd)
-        
-        # Set to always-on-top
-        result4 = user32.SetWindowPos(
-            hwnd,
-            HWND_TOPMOST,
-            0, 0, 0, 0,
-            SWP_NOMOVE | SWP_NOSIZE
-        )
-        
-        print(f"[ActivateWindow] Results - Restore: {result1}, Foreground: {result2}, "
-              f"BringToTop: {result3}, Topmost: {result4}", file=sys.stderr, flush=True)
-        return True
-    
-    print(f"[ActivateWindow] Failed: No window found", file=sys.stderr, flush=True)
-    return False
+    log.info("[ActivateWindow] PID %s", pid)
+    found, _ = activate_and_topmost(pid, True)
+    return found
 
 
 def set_window_topmost(pid, topmost=True):
@@ -204,28 +434,9 @@ def set_window_topmost(pid, topmost=True):
         pid: Process ID
         topmost: True to set always-on-top, False to remove
     """
-    print(f"[SetTopmost] PID {pid}, topmost={topmost}", file=sys.stderr, flush=True)
-    hwnd = find_window_by_pid(pid)
-    
-    if hwnd:
-        # First activate the window
-        user32.ShowWindow(hwnd, SW_RESTORE)
-        user32.SetForegroundWindow(hwnd)
-        
-        # Set topmost status
-        hwnd_insert = HWND_TOPMOST if topmost else HWND_NOTOPMOST
-        result = user32.SetWindowPos(
-            hwnd,
-            hwnd_insert,
-            0, 0, 0, 0,
-            SWP_NOMOVE | SWP_NOSIZE
-        )
-        
-        print(f"[SetTopmost] Result: {result}", file=sys.stderr, flush=True)
-        return bool(result)
-    
-    print(f"[SetTopmost] Failed: No window found", file=sys.stderr, flush=True)
-    return False
+    log.info("[SetTopmost] PID %s, topmost=%s", pid, topmost)
+    _, result = activate_and_topmost(pid, topmost)
+    return bool(result)
 
 
 def hide_window(pid):
@@ -260,9 +471,15 @@ def get_window_state(pid):
     hwnd = find_window_by_pid(pid)
     
     if hwnd:
-        if user32.IsIconic(hwnd):
+        # One call reports minimized/maximized/normal together
+        placement = WINDOWPLACEMENT()
+        placement.length = ctypes.sizeof(WINDOWPLACEMENT)
+        if not user32.GetWindowPlacement(hwnd, ctypes.byref(placement)):
+            forget_window(pid)
+            return "not_found"
+        if placement.showCmd in MINIMIZED_SHOW_CMDS:
             return "minimized"
-        elif user32.IsZoomed(hwnd):
+        elif placement.showCmd == SW_SHOWMAXIMIZED:
             return "maximized"
         else:
             return "normal"
@@ -315,4 +532,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     main()
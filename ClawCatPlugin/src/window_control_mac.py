@@ -3,170 +3,368 @@
 macOS Window Control Module
 Control terminal windows by PID using AppleScript wrapper
 """
+import functools
+import json
+import logging
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+try:
+    import psutil as _psutil
+except ImportError:
+    _psutil = None
+
+# Logs go through the "clawcat" logger configured by launch_window
+# (or by __main__ below when run on its own)
+log = logging.getLogger("clawcat.window")
 
 # ============================================================================
 # AppleScript Wrapper
 # ============================================================================
 
-def run_applescript(script):
+# One long-lived osascript (JavaScript for Automation) process compiles and
+# runs each AppleScript sent on stdin via NSAppleScript, so a call costs a
+# pipe round-trip instead of an osascript fork+exec. Compiled scripts are kept
+# by source text, and arguments reach the script's "on run argv" handler, so
+# the constant scripts below are parsed only once per helper process.
+# Request: one JSON line {"script": ..., "args": [...]}.
+# Reply: one "OK<TAB>result" or "ERR<TAB>message" line.
+OSA_TIMEOUT = 5
+
+_OSA_SERVER_JS = r"""
+ObjC.import('Foundation');
+const input = $.NSFileHandle.fileHandleWithStandardInput;
+const output = $.NSFileHandle.fileHandleWithStandardOutput;
+const BOOLEAN_TYPES = [0x74727565, 0x66616c73, 0x626f6f6c];  // 'true', 'fals', 'bool'
+const compiled = {};
+
+function reply(line) {
+    line = line.replace(/[\r\n]+/g, ' ') + '\n';
+    output.writeData($(line).dataUsingEncoding($.NSUTF8StringEncoding));
+}
+
+function describe(result) {
+    if (BOOLEAN_TYPES.indexOf(result.descriptorType) >= 0) {
+        return result.booleanValue ? 'true' : 'false';
+    }
+    const text = result.stringValue;
+    return text.isNil() ? '' : text.js;
+}
+
+function errorMessage(error) {
+    try {
+        return ObjC.unwrap(error[0].objectForKey('NSAppleScriptErrorMessage')) || 'AppleScript error';
+    } catch (e) {
+        return 'AppleScript error';
+    }
+}
+
+function runRequest(request) {
+    const error = Ref();
+    let script = compiled[request.script];
+    if (!script) {
+        script = $.NSAppleScript.alloc.initWithSource(request.script);
+        if (!script.compileAndReturnError(error)) return 'ERR\t' + errorMessage(error);
+        compiled[request.script] = script;
+    }
+    let result;
+    if (request.args.length) {
+        // Run event ('aevt'/'oapp') whose direct object is the argv list
+        const argv = $.NSAppleEventDescriptor.listDescriptor;
+        request.args.forEach(function (arg, i) {
+            argv.insertDescriptorAtIndex($.NSAppleEventDescriptor.descriptorWithString(arg), i + 1);
+        });
+        const event = $.NSAppleEventDescriptor.appleEventWithEventClassEventIDTargetDescriptorReturnIDTransactionID(
+            0x61657674, 0x6f617070, $.NSAppleEventDescriptor.nullDescriptor, -1, 0);
+        event.setParamDescriptorForKeyword(argv, 0x2d2d2d2d);  // keyDirectObject '----'
+        result = script.executeAppleEventError(event, error);
+    } else {
+        result = script.executeAndReturnError(error);
+    }
+    return result.isNil() ? 'ERR\t' + errorMessage(error) : 'OK\t' + describe(result);
+}
+
+let buffer = '';
+while (true) {
+    const data = input.availableData;
+    if (data.length == 0) break;  // stdin closed: parent went away
+    buffer += $.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding).js;
+    let end;
+    while ((end = buffer.indexOf('\n')) >= 0) {
+        const line = buffer.slice(0, end);
+        buffer = buffer.slice(end + 1);
+        let response;
+        try {
+            response = runRequest(JSON.parse(line));
+        } catch (e) {
+            response = 'ERR\t' + e;
+        }
+        reply(response);
+    }
+}
+"""
+
+_osa_proc = None
+_osa_lock = threading.Lock()
+# False until the current helper has answered once (JXA startup + first
+# System Events launch regularly take longer than OSA_CALL_TIMEOUT)
+_osa_warm = False
+
+def _osa_server():
+    """Return the running osascript helper, (re)starting it if needed (caller holds _osa_lock)"""
+    global _osa_proc, _osa_warm
+    if _osa_proc is None or _osa_proc.poll() is not None:
+        _osa_warm = False
+        _osa_proc = subprocess.Popen(
+            ['osascript', '-l', 'JavaScript', '-e', _OSA_SERVER_JS],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+    return _osa_proc
+
+def run_applescript(script, *args):
     """
     Execute AppleScript code from Python
     
-    This is the "wrapper" pattern: Python calls macOS's osascript command
-    to execute AppleScript, which controls the window system.
+    This is the "wrapper" pattern: Python hands the script to a persistent
+    osascript helper, which executes it and controls the window system.
+    args (converted to strings) are passed to the script's "on run argv"
+    handler. A call that takes longer than OSA_TIMEOUT seconds kills the
+    helper; the next call starts a fresh one.
     
     Returns:
         (success: bool, output: str)
     """
-    try:
-        result = subprocess.run(
-            ['osascript', '-e', script],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        return result.returncode == 0, result.stdout.strip()
-    except subprocess.TimeoutExpired:
-        print(f"[AppleScript] Timeout", file=sys.stderr, flush=True)
-        return False, ""
-    except Exception as e:
-        print(f"[AppleScript] Error: {e}", file=sys.stderr, flush=True)
-        return False, ""
+    global _osa_proc, _osa_warm
+    with _osa_lock:
+        try:
+            proc = _osa_server()
+            watchdog = threading.Timer(OSA_TIMEOUT, proc.kill)
+            watchdog.start()
+            try:
+                request = {"script": script, "args": [str(arg) for arg in args]}
+                proc.stdin.write(json.dumps(request) + "\n")
+                proc.stdin.flush()
+                line = proc.stdout.readline()
+            finally:
+                watchdog.cancel()
+            if not line:
+                # Helper was killed by the watchdog or exited on its own
+                log.warning("[AppleScript] Timeout")
+                proc.kill()
+                _osa_proc, _osa_warm = None, False
+                return False, ""
+            _osa_warm = True
+            status, _, output = line.rstrip("\n").partition("\t")
+            return status == "OK", output.strip()
+        except Exception as e:
+            log.warning("[AppleScript] Error: %s", e)
+            if _osa_proc is not None:
+                _osa_proc.kill()
+                _osa_proc, _osa_warm = None, False
+            return False, ""
+
+# Window operations run on one dedicated AppleScript thread; callers (HTTP
+# request threads) stop waiting after OSA_CALL_TIMEOUT seconds while a slow
+# operation finishes in the background. While the helper is still cold the
+# caller waits out the helper's own OSA_TIMEOUT instead, so a slow first call
+# is not reported as failed and then carried out anyway
+OSA_CALL_TIMEOUT = 1.0
+_osa_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="clawcat-osa")
+
+def on_osa_thread(default):
+    """Decorator: run a window operation on the AppleScript thread, returning default on timeout"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timeout = OSA_CALL_TIMEOUT if _osa_warm else OSA_TIMEOUT + OSA_CALL_TIMEOUT
+            future = _osa_executor.submit(func, *args, **kwargs)
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeout:
+                log.warning("[AppleScript] %s still running after %ss, not waiting", func.__name__, timeout)
+                return default
+        return wrapper
+    return decorator
 
 # ============================================================================
 # Window Discovery
 # ============================================================================
 
+# Ancestors of a PID, resolved once per PID: pid -> [(parent_pid, name), ...]
+# (nearest first). Dropped when nothing in the chain yields a process name.
+MAX_PARENT_DEPTH = 10
+_parent_chain_cache = {}
+_parent_chain_lock = threading.Lock()
+
+def parent_chain(pid):
+    """Ancestors of pid as (pid, name) pairs, nearest first ([] without psutil)"""
+    with _parent_chain_lock:
+        chain = _parent_chain_cache.get(pid)
+    if chain is not None:
+        return chain
+    
+    chain = []
+    if _psutil is None:
+        log.warning("[FindWindow] psutil not available")
+        return chain
+    
+    current_pid = pid
+    for depth in range(MAX_PARENT_DEPTH):
+        try:
+            parent = _psutil.Process(current_pid).parent()
+            if not parent or parent.pid == current_pid:
+                log.info("[FindWindow] Reached end of parent chain")
+                break
+            chain.append((parent.pid, parent.name()))
+            current_pid = parent.pid
+        except (_psutil.NoSuchProcess, _psutil.AccessDenied) as e:
+            log.warning("[FindWindow] Error accessing parent: %s", e)
+            break
+    
+    with _parent_chain_lock:
+        _parent_chain_cache[pid] = chain
+    return chain
+
+def forget_parent_chain(pid):
+    """Drop the cached ancestors of pid so the next lookup walks the tree again"""
+    with _parent_chain_lock:
+        _parent_chain_cache.pop(pid, None)
+
+# Resolved applications: pid -> (app_name, expiry on the monotonic clock)
+APP_CACHE_TTL = 5.0
+_app_cache = {}
+_app_cache_lock = threading.Lock()
+
+def cache_app(pids, app_name):
+    """Remember app_name for each of pids for APP_CACHE_TTL seconds"""
+    expiry = time.monotonic() + APP_CACHE_TTL
+    with _app_cache_lock:
+        for pid in pids:
+            _app_cache[pid] = (app_name, expiry)
+
+PROCESS_NAME_SCRIPT = '''
+on run argv
+    set targetPid to (item 1 of argv) as integer
+    tell application "System Events"
+        try
+            set theProcess to first process whose unix id is targetPid
+            return name of theProcess
+        on error
+            return ""
+        end try
+    end tell
+end run
+'''
+
+def process_name(pid):
+    """Name of the System Events process with this unix id, or "" if there is none"""
+    success, app_name = run_applescript(PROCESS_NAME_SCRIPT, int(pid))
+    return app_name if success else ""
+
 def find_window_by_pid(pid):
     """
     Find application by process ID
     
     If no window is found for the given PID, recursively searches parent
-    processes (up to 10 levels) to find the terminal application.
+    processes (up to 10 levels) to find the terminal application. Results
+    are cached for APP_CACHE_TTL seconds to avoid repeated osascript runs.
     
     Returns:
         Application name (str) or None
     """
-    script = f'''
-        tell application "System Events"
-            try
-                set theProcess to first process whose unix id is {pid}
-                return name of theProcess
-            on error
-                return ""
-            end try
-        end tell
-    '''
-    
-    success, app_name = run_applescript(script)
-    if success and app_name:
-        print(f"[FindWindow] Found process for PID {pid}: {app_name}", 
-              file=sys.stderr, flush=True)
+    with _app_cache_lock:
+        cached = _app_cache.get(pid)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+    
+    app_name = process_name(pid)
+    if app_name:
+        log.info("[FindWindow] Found process for PID %s: %s", pid, app_name)
+        cache_app((pid,), app_name)
         return app_name
     
     # No window found, search parent processes
-    print(f"[FindWindow] No window for PID {pid}, searching parent chain...", 
-          file=sys.stderr, flush=True)
+    log.info("[FindWindow] No window for PID %s, searching parent chain...", pid)
     
     try:
-        import psutil
-        current_pid = pid
-        max_depth = 10
-        
-        for depth in range(max_depth):
-            try:
-                proc = psutil.Process(current_pid)
-                parent = proc.parent()
-                
-                if not parent or parent.pid == current_pid:
-                    print(f"[FindWindow] Reached end of parent chain", 
-                          file=sys.stderr, flush=True)
-                    break
-                
-                parent_pid = parent.pid
-                print(f"[FindWindow] Trying parent PID {parent_pid} ({parent.name()})", 
-                      file=sys.stderr, flush=True)
-                
-                script = f'''
-                    tell application "System Events"
-                        try
-                            set theProcess to first process whose unix id is {parent_pid}
-                            return name of theProcess
-                        on error
-                            return ""
-                        end try
-                    end tell
-                '''
-                success, app_name = run_applescript(script)
-                if success and app_name:
-                    return app_name
-                
-                current_pid = parent_pid
-                
-            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                print(f"[FindWindow] Error accessing parent: {e}", 
-                      file=sys.stderr, flush=True)
-                break
-                
-    except ImportError:
-        print(f"[FindWindow] psutil not available", file=sys.stderr, flush=True)
+        for parent_pid, parent_name in parent_chain(pid):
+            log.info("[FindWindow] Trying parent PID %s (%s)", parent_pid, parent_name)
+            
+            app_name = process_name(parent_pid)
+            if app_name:
+                cache_app((pid, parent_pid), app_name)
+                return app_name
     except Exception as e:
-        print(f"[FindWindow] Error: {e}", file=sys.stderr, flush=True)
+        log.warning("[FindWindow] Error: %s", e)
     
-    print(f"[FindWindow] No window found for PID {pid}", file=sys.stderr, flush=True)
+    forget_parent_chain(pid)
+    log.warning("[FindWindow] No window found for PID %s", pid)
     return None
 
 # ============================================================================
 # Window Control Functions (compatible with Windows version)
 # ============================================================================
 
+MINIMIZE_SCRIPT = '''
+on run argv
+    set targetPid to (item 1 of argv) as integer
+    tell application "System Events"
+        try
+            set visible of first process whose unix id is targetPid to false
+            return "success"
+        on error errMsg
+            return errMsg
+        end try
+    end tell
+end run
+'''
+
+@on_osa_thread(default=False)
 def minimize_window(pid):
     """
     Minimize window to dock
     
     AppleScript: set visible to false = hide the application
     """
-    print(f"[MinimizeWindow] PID {pid}", file=sys.stderr, flush=True)
+    log.info("[MinimizeWindow] PID %s", pid)
     
-    script = f'''
-        tell application "System Events"
-            try
-                set visible of first process whose unix id is {pid} to false
-                return "success"
-            on error errMsg
-                return errMsg
-            end try
-        end tell
-    '''
-    
-    success, output = run_applescript(script)
+    success, output = run_applescript(MINIMIZE_SCRIPT, pid)
     result = success and output == "success"
-    print(f"[MinimizeWindow] Result: {result}", file=sys.stderr, flush=True)
+    log.info("[MinimizeWindow] Result: %s", result)
     return result
 
 
+MAXIMIZE_SCRIPT = '''
+on run argv
+    set targetPid to (item 1 of argv) as integer
+    tell application "System Events"
+        try
+            tell (first process whose unix id is targetPid)
+                set value of attribute "AXFullScreen" of window 1 to true
+            end tell
+            return "success"
+        on error errMsg
+            return errMsg
+        end try
+    end tell
+end run
+'''
+
+@on_osa_thread(default=False)
 def maximize_window(pid):
     """
     Maximize window (fullscreen on macOS)
     
     Note: macOS doesn't have traditional "maximize", this enters fullscreen
     """
-    script = f'''
-        tell application "System Events"
-            try
-                tell (first process whose unix id is {pid})
-                    set value of attribute "AXFullScreen" of window 1 to true
-                end tell
-                return "success"
-            on error errMsg
-                return errMsg
-            end try
-        end tell
-    '''
-    
-    success, output = run_applescript(script)
+    success, output = run_applescript(MAXIMIZE_SCRIPT, pid)
     return success and output == "success"
 
 
@@ -179,6 +377,23 @@ def restore_window(pid):
     return activate_window(pid)
 
 
+ACTIVATE_SCRIPT = '''
+on run argv
+    set targetPid to (item 1 of argv) as integer
+    tell application "System Events"
+        try
+            set theProcess to first process whose unix id is targetPid
+            set visible of theProcess to true
+            set frontmost of theProcess to true
+            return "success"
+        on error errMsg
+            return errMsg
+        end try
+    end tell
+end run
+'''
+
+@on_osa_thread(default=False)
 def activate_window(pid):
     """
     Activate window and bring to front
@@ -188,25 +403,12 @@ def activate_window(pid):
     2. Brings it to the foreground
     3. Note: macOS doesn't support always-on-top natively
     """
-    print(f"[ActivateWindow] PID {pid}", file=sys.stderr, flush=True)
-    
-    # Two-step process: show + activate
-    script = f'''
-        tell application "System Events"
-            try
-                set theProcess to first process whose unix id is {pid}
-                set visible of theProcess to true
-                set frontmost of theProcess to true
-                return "success"
-            on error errMsg
-                return errMsg
-            end try
-        end tell
-    '''
+    log.info("[ActivateWindow] PID %s", pid)
     
-    success, output = run_applescript(script)
+    # Two-step process: show + activate (see ACTIVATE_SCRIPT)
+    success, output = run_applescript(ACTIVATE_SCRIPT, pid)
     result = success and output == "success"
-    print(f"[ActivateWindow] Result: {result}", file=sys.stderr, flush=True)
+    log.info("[ActivateWindow] Result: %s", result)
     return result
 
 
@@ -221,9 +423,8 @@ def set_window_topmost(pid, topmost=True):
         pid: Process ID
         topmost: True to activate, False to do nothing
     """
-    print(f"[SetTopmost] PID {pid}, topmost={topmost}", file=sys.stderr, flush=True)
-    print(f"[SetTopmost] ⚠️ macOS does not support always-on-top", 
-          file=sys.stderr, flush=True)
+    log.info("[SetTopmost] PID %s, topmost=%s", pid, topmost)
+    log.warning("[SetTopmost] ⚠️ macOS does not support always-on-top")
     
     if topmost:
         # Can only bring to front, cannot "pin" on top
@@ -238,23 +439,48 @@ def hide_window(pid):
     return minimize_window(pid)
 
 
+SHOW_SCRIPT = '''
+on run argv
+    set targetPid to (item 1 of argv) as integer
+    tell application "System Events"
+        try
+            set visible of first process whose unix id is targetPid to true
+            return "success"
+        on error errMsg
+            return errMsg
+        end try
+    end tell
+end run
+'''
+
+@on_osa_thread(default=False)
 def show_window(pid):
     """Show previously hidden window"""
-    script = f'''
-        tell application "System Events"
-            try
-                set visible of first process whose unix id is {pid} to true
-                return "success"
-            on error errMsg
-                return errMsg
-            end try
-        end tell
-    '''
-    
-    success, output = run_applescript(script)
+    success, output = run_applescript(SHOW_SCRIPT, pid)
     return success and output == "success"
 
 
+WINDOW_STATE_SCRIPT = '''
+on run argv
+    set targetPid to (item 1 of argv) as integer
+    tell application "System Events"
+        try
+            set theProcess to first process whose unix id is targetPid
+        on error
+            return "not_found"
+        end try
+        set isVisible to visible of theProcess
+        try
+            set isFullscreen to value of attribute "AXFullScreen" of window 1 of theProcess
+        on error
+            set isFullscreen to false
+        end try
+        return (isVisible as string) & ":" & (isFullscreen as string)
+    end tell
+end run
+'''
+
+@on_osa_thread(default="not_found")
 def get_window_state(pid):
     """
     Get current window state
@@ -262,38 +488,16 @@ def get_window_state(pid):
     Returns:
         'minimized', 'maximized', 'normal', or 'not_found'
     """
-    # Check if visible (not hidden/minimized)
-    script = f'''
-        tell application "System Events"
-            try
-                return visible of first process whose unix id is {pid}
-            on error
-                return "not_found"
-            end try
-        end tell
-    '''
-    success, visible = run_applescript(script)
+    # Visibility and fullscreen in one round-trip, as "<visible>:<fullscreen>"
+    success, output = run_applescript(WINDOW_STATE_SCRIPT, pid)
     
-    if not success or visible == "not_found":
+    if not success or output == "not_found":
         return "not_found"
     
+    visible, _, fullscreen = output.partition(":")
     if visible == "false":
         return "minimized"
     
-    # Check if fullscreen
-    script = f'''
-        tell application "System Events"
-            try
-                tell (first process whose unix id is {pid})
-                    return value of attribute "AXFullScreen" of window 1
-                end tell
-            on error
-                return "false"
-            end try
-        end tell
-    '''
-    success, fullscreen = run_applescript(script)
-    
     if fullscreen == "true":
         return "maximized"
     
@@ -346,5 +550,6 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     main()
 
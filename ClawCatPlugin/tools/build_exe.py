@@ -10,6 +10,11 @@ import subprocess
 import shutil
 import io
 import os
+import struct
+import importlib.metadata
+import importlib.util
+import threading
+import uuid
 from pathlib import Path
 
 # Fix Windows console encoding
@@ -25,11 +30,11 @@ PUBLIC_DIR = PLUGIN_ROOT / "public"  # 目标目录
 
 def check_pyinstaller():
     """检查 PyInstaller 是否已安装"""
+    # 版本号从安装元数据读取，不导入 PyInstaller 本身
     try:
-        import PyInstaller
-        print(f"[OK] PyInstaller found: {PyInstaller.__version__}")
+        print(f"[OK] PyInstaller found: {importlib.metadata.version('pyinstaller')}")
         return True
-    except ImportError:
+    except importlib.metadata.PackageNotFoundError:
         print("[ERROR] PyInstaller not found")
         print("  Installing PyInstaller...")
         try:
@@ -54,10 +59,13 @@ def check_dependencies():
     }
     missing = []
     
+    # 只用 find_spec 定位模块，不真正导入（PyQt5/WebEngine 导入要几百毫秒）
     for package_name, import_name in required.items():
         try:
-            __import__(import_name)
-        except ImportError:
+            found = importlib.util.find_spec(import_name) is not None
+        except (ImportError, ValueError):
+            found = False
+        if not found:
             missing.append(package_name)
     
     if missing:
@@ -68,33 +76,74 @@ def check_dependencies():
     print("[OK] All dependencies found")
     return True
 
+ICON_SIZES = [(256, 256), (128, 128), (64, 64), (32, 32), (16, 16)]
+
+def png_size(png_bytes):
+    """从 PNG 的 IHDR 读取 (宽, 高)，不是 PNG 时返回 None"""
+    if png_bytes[:8] != b"\x89PNG\r\n\x1a\n" or png_bytes[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", png_bytes[16:24])
+
+def write_png_ico(icon_path, png_bytes, size):
+    """把 PNG 原样包进单帧 ICO（Vista 起支持 PNG 帧），不需要 Pillow"""
+    width, height = size
+    header = struct.pack("<HHH", 0, 1, 1)  # ICONDIR: reserved, type=icon, 1 帧
+    # ICONDIRENTRY: 256 记为 0；32 位色；数据紧跟在 6+16 字节的头后面
+    entry = struct.pack("<BBBBHHII", width % 256, height % 256, 0, 0, 1, 32,
+                        len(png_bytes), len(header) + 16)
+    icon_path.write_bytes(header + entry + png_bytes)
+
 def create_icon():
-    """从 logo.png 创建图标文件"""
+    """从 logo.png 创建图标文件
+
+    icon.ico 比 logo.png 新时直接复用；否则用 Pillow 生成多尺寸图标，
+    没有 Pillow 时把 logo.png 直接包成 ICO。
+    """
+    # 使用 logo.png
+    logo_path = PLUGIN_ROOT / "public" / "logo.png"
+    # 创建图标文件
+    icon_path = PLUGIN_ROOT / "icon.ico"
+    
+    try:
+        logo_mtime = logo_path.stat().st_mtime
+    except OSError:
+        print(f"[WARN] logo.png not found at {logo_path}, skipping icon creation")
+        return None
+    
+    try:
+        if icon_path.stat().st_mtime >= logo_mtime:
+            print(f"[OK] Icon up to date: {icon_path}")
+            return icon_path
+    except OSError:
+        pass
+    
     try:
         from PIL import Image
+    except ImportError:
+        Image = None
+    
+    try:
+        if Image is None:
+            png_bytes = logo_path.read_bytes()
+            size = png_size(png_bytes)
+            if size not in ICON_SIZES:
+                print("[WARN] PIL/Pillow not installed and logo.png is not a standard icon size, "
+                      "skipping icon creation")
+                print("  Install with: pip install Pillow")
+                return None
+            write_png_ico(icon_path, png_bytes, size)
+            print(f"[OK] Icon created from logo.png (single {size[0]}px frame): {icon_path}")
+            return icon_path
         
-        # 使用 logo.png
-        logo_path = PLUGIN_ROOT / "public" / "logo.png"
-        
-        if not logo_path.exists():
-            print(f"[WARN] logo.png not found at {logo_path}, skipping icon creation")
-            return None
-        
-        # 创建图标文件
-        icon_path = PLUGIN_ROOT / "icon.ico"
-        
-        # 打开图片并调整大小
-        img = Image.open(logo_path)
+        # 打开图片，只解码一次
+        base = Image.open(logo_path).convert("RGBA")
         # 创建多个尺寸的图标（Windows 需要）
-        sizes = [(256, 256), (128, 128), (64, 64), (32, 32), (16, 16)]
-        img.save(icon_path, format='ICO', sizes=sizes)
+        # 每个尺寸用 LANCZOS 预先缩放一次，通过 append_images 交给 ICO 编码器直接使用
+        frames = [base.resize(size, Image.LANCZOS) for size in ICON_SIZES]
+        frames[0].save(icon_path, format='ICO', sizes=ICON_SIZES, append_images=frames[1:])
         
         print(f"[OK] Icon created from logo.png: {icon_path}")
         return icon_path
-    except ImportError:
-        print("[WARN] PIL/Pillow not installed, skipping icon creation")
-        print("  Install with: pip install Pillow")
-        return None
     except Exception as e:
         print(f"[WARN] Failed to create icon: {e}")
         return None
@@ -102,20 +151,37 @@ def create_icon():
 def check_dist():
     """检查前端构建文件是否存在"""
     public_dir = PLUGIN_ROOT / "public"
-    if not public_dir.exists():
-        print("[ERROR] Frontend public/ directory not found")
-        print("  Build frontend first with: npm run build")
-        return False
-    
     index_html = public_dir / "index.html"
-    if not index_html.exists():
-        print("[ERROR] Frontend index.html not found in public/")
+    # 正常情况只 stat 一次 index.html；找不到时才区分是缺目录还是缺文件
+    if not index_html.is_file():
+        if not public_dir.exists():
+            print("[ERROR] Frontend public/ directory not found")
+        else:
+            print("[ERROR] Frontend index.html not found in public/")
         print("  Build frontend first with: npm run build")
         return False
     
     print("[OK] Frontend build found in public/")
     return True
 
+def discard_dir(path):
+    """把目录改名移开（原子操作），再在后台线程删除；返回删除线程（同步删除时为 None）
+
+    PyInstaller 的 build/ 有成千上万个小文件，逐个删除很慢，
+    改名后主流程可以立即继续。线程不是 daemon，进程退出前会等它删完。
+    """
+    trash = path.with_name(f"{path.name}.trash-{uuid.uuid4().hex}")
+    try:
+        path.rename(trash)
+    except OSError:
+        # 改名失败（例如文件被占用）时只能原地同步删除：
+        # PyInstaller 马上要往这个目录里写，后台删除会和它竞争
+        shutil.rmtree(path, ignore_errors=True)
+        return None
+    thread = threading.Thread(target=shutil.rmtree, args=(trash,), kwargs={"ignore_errors": True})
+    thread.start()
+    return thread
+
 def build():
     """执行打包"""
     print("=" * 60)
@@ -123,27 +189,30 @@ def build():
     print("=" * 60)
     print()
     
-    # 检查依赖
-    if not check_pyinstaller():
+    # 检查依赖：先做只需 stat / find_spec 的检查，失败时不用再去检查（甚至安装）PyInstaller
+    if not check_dist():
         return False
     
     if not check_dependencies():
         return False
     
-    if not check_dist():
+    if not check_pyinstaller():
         return False
     
-    # 创建图标文件
-    icon_path = create_icon()
+    # 清理旧的构建文件（改名后在后台删除，包括上次中断时残留的 *.trash-*）
+    for leftover in list(PLUGIN_ROOT.glob("dist.trash-*")) + list(PLUGIN_ROOT.glob("build.trash-*")):
+        discard_dir(leftover)
     
-    # 清理旧的构建文件
     if DIST_DIR.exists():
         print(f"Cleaning old build directory: {DIST_DIR}")
-        shutil.rmtree(DIST_DIR)
+        discard_dir(DIST_DIR)
     
     if BUILD_DIR.exists():
         print(f"Cleaning old build cache: {BUILD_DIR}")
-        shutil.rmtree(BUILD_DIR)
+        discard_dir(BUILD_DIR)
+    
+    # 创建图标文件
+    icon_path = create_icon()
     
     # 执行打包
     print()
@@ -5,30 +5,52 @@ Checks and installs required Python and Node.js dependencies.
 """
 
 import sys
+import functools
 import subprocess
 import shutil
+import importlib.util
 from pathlib import Path
 
 PLUGIN_ROOT = Path(__file__).parent.parent.absolute()
 
+# Distribution name -> module to look for (PyQtWebEngine lives under PyQt5)
+REQUIRED_PACKAGES = {
+    "PyQt5": "PyQt5",
+    "PyQtWebEngine": "PyQt5.QtWebEngineWidgets",
+    "requests": "requests",
+    "psutil": "psutil",
+}
+
+@functools.lru_cache(maxsize=None)
+def which(name):
+    """shutil.which, memoized: PATH is searched once per command per process"""
+    return shutil.which(name)
+
+def is_module_available(module_name):
+    """Locate a module on sys.path without importing (initializing) it"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
 def check_python_packages():
     """Check which Python packages are missing"""
-    required_packages = ["PyQt5", "PyQtWebEngine", "requests", "psutil"]
-    missing = []
-
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing.append(package)
-
-    return missing
+    return [package for package, module_name in REQUIRED_PACKAGES.items()
+            if not is_module_available(module_name)]
 
 def check_node_modules():
     """Check if node_modules exists"""
     node_modules = PLUGIN_ROOT / "node_modules"
     return node_modules.exists()
 
+def pip_install_command(*args):
+    """pip install command for this interpreter: uv's pip when it is on PATH
+    (parallel downloads, shared cache), otherwise python -m pip"""
+    uv = which("uv")
+    if uv:
+        return [uv, "pip", "install", "--python", sys.executable, *args]
+    return [sys.executable, "-m", "pip", "install", *args]
+
 def install_python_packages():
     """Install Python packages from requirements.txt"""
     requirements_file = PLUGIN_ROOT / "requirements.txt"
@@ -39,20 +61,15 @@ def install_python_packages():
 
     print("Installing Python dependencies...")
     print(f"  Using: {sys.executable}")
-    print(f"  From: {requirements_file}")
+    print(f"  From: {requirements_file}", flush=True)
 
+    # Output goes straight to the console so progress shows while pip runs
     try:
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "-r", str(requirements_file)],
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        subprocess.run(pip_install_command("-r", str(requirements_file)), check=True)
         print("ok Python dependencies installed successfully")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"error Error installing Python dependencies:")
-        print(e.stderr)
+    except subprocess.CalledProcessError:
+        print(f"error Error installing Python dependencies")
         return False
 
 def install_node_packages():
@@ -65,27 +82,21 @@ def install_node_packages():
 
     # Determine which package manager to use
     npm_cmd = "npm"
-    if shutil.which("pnpm"):
+    if which("pnpm"):
         npm_cmd = "pnpm"
-    elif shutil.which("yarn"):
+    elif which("yarn"):
         npm_cmd = "yarn"
 
     print(f"Installing Node.js dependencies using {npm_cmd}...")
-    print(f"  Working directory: {PLUGIN_ROOT}")
+    print(f"  Working directory: {PLUGIN_ROOT}", flush=True)
 
+    # Output goes straight to the console instead of being buffered in memory
     try:
-        result = subprocess.run(
-            [npm_cmd, "install"],
-            cwd=str(PLUGIN_ROOT),
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        subprocess.run([npm_cmd, "install"], cwd=str(PLUGIN_ROOT), check=True)
         print(f"ok Node.js dependencies installed successfully")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"error Error installing Node.js dependencies:")
-        print(e.stderr)
+    except subprocess.CalledProcessError:
+        print(f"error Error installing Node.js dependencies")
         return False
 
 def main():